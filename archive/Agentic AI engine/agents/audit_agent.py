@@ -6,6 +6,8 @@ Tracks data mutations, security events, and administrative actions.
 import logging
 from datetime import datetime
 
+from sqlalchemy import insert
+
 from database.models import AuditLog, SessionLocal
 
 logger = logging.getLogger(__name__)
@@ -41,16 +43,18 @@ class AuditAgent:
         """
         db = self._db_factory()
         try:
-            audit = AuditLog(
-                actor_id=actor_id,
-                role=role,
-                action=action,
-                resource_target=resource,
-                status=status,
-                details=details or {},
-                ip_address=ip,
+            # Write-only table: a Core INSERT skips ORM object and unit-of-work setup
+            db.execute(
+                insert(AuditLog).values(
+                    actor_id=actor_id,
+                    role=role,
+                    action=action,
+                    resource_target=resource,
+                    status=status,
+                    details=details or {},
+                    ip_address=ip,
+                )
             )
-            db.add(audit)
             db.commit()
             logger.info(f"Audit log created: {action} on {resource} by {actor_id}")
         except Exception as e:
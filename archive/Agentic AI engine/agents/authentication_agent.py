@@ -2,6 +2,7 @@
 Authentication Agent - Secure Identity and Session Management.
 """
 
+import asyncio
 import logging
 
 from agents.governance_agent import GovernanceAgent
@@ -25,8 +26,9 @@ class AuthenticationAgent:
 
     async def validate_login(self, login_id, password, ip=None):
         user = await self.persistence.get_user_by_login(login_id)
-        if not user or not self.governance.verify_password(
-            password, user.password_hash
+        # bcrypt verification is CPU-bound; run it in a worker thread
+        if not user or not await asyncio.to_thread(
+            self.governance.verify_password, password, user.password_hash
         ):
             if user:
                 await self.persistence.log_user_activity(
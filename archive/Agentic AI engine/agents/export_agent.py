@@ -3,7 +3,6 @@ Export Agent - Generates validated, professional medical reports in PDF format.
 Includes cryptographic signatures (Audit Hashes) and security watermarks.
 """
 
-import json
 import logging
 from datetime import datetime
 
@@ -94,7 +93,9 @@ class ExportAgent:
 
             # Final signature of the whole report
             try:
-                report_hash = self.governance.sign_evidence(json.dumps(interactions))
+                report_hash = self.governance.sign_evidence(
+                    self.governance.canonical_evidence(interactions)
+                )
                 pdf.ln(5)
                 pdf.set_font("helvetica", "B", 8)
                 pdf.cell(
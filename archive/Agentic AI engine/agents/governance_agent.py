@@ -9,11 +9,16 @@ import hmac
 import json
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import Union
 
+import bcrypt
 import jwt
+import orjson
+from cachetools import TLRUCache
 from cryptography.fernet import Fernet
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from config import settings
@@ -23,6 +28,19 @@ from database.models import (AsyncSessionLocal, AuditLog, Interaction,
 
 logger = logging.getLogger(__name__)
 
+TOKEN_CACHE_TTL = 30  # seconds
+
+# Verified JWT payloads shared by every GovernanceAgent in the process. An entry
+# lives TOKEN_CACHE_TTL seconds at most and never past the token's own exp.
+_verified_tokens = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _token, payload, now: min(
+        now + TOKEN_CACHE_TTL, payload.get("exp", now)
+    ),
+    timer=time.time,
+)
+_verified_tokens_lock = threading.Lock()
+
 
 class GovernanceAgent:
     """
@@ -41,9 +59,6 @@ class GovernanceAgent:
             )
         self.cipher = Fernet(self._key.encode())
 
-        # Password Hashing
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
         # JWT Config (must be provided via env)
         self.jwt_secret = os.getenv("JWT_SECRET_KEY") or getattr(
             settings, "JWT_SECRET_KEY", None
@@ -62,20 +77,72 @@ class GovernanceAgent:
             return ""
         return self.cipher.encrypt(data.encode()).decode()
 
+    def _decrypt_raw_batch(self, tokens: list) -> list:
+        """Plaintext bytes per token, order preserved.
+
+        b"" for an empty token, None for one that fails to decrypt. The
+        cipher is bound once for the whole batch.
+        """
+        decrypt = self.cipher.decrypt
+        results = []
+        for token in tokens:
+            if not token:
+                results.append(b"")
+                continue
+            try:
+                results.append(decrypt(token.encode()))
+            except Exception:
+                results.append(None)
+        return results
+
     def decrypt(self, token: str) -> str:
-        if not token:
-            return ""
-        try:
-            return self.cipher.decrypt(token.encode()).decode()
-        except Exception:
-            return "[ENCRYPTED_DATA_ERROR]"
+        return self.decrypt_batch([token])[0]
+
+    def decrypt_batch(self, tokens: list) -> list:
+        """decrypt over many tokens, order preserved."""
+        results = []
+        for plain in self._decrypt_raw_batch(tokens):
+            try:
+                results.append(plain.decode())
+            except (AttributeError, UnicodeDecodeError):
+                results.append("[ENCRYPTED_DATA_ERROR]")
+        return results
+
+    def decrypt_json(self, token: str):
+        """Decrypt a JSON document: {} if the token is empty, None if unreadable."""
+        return self.decrypt_json_batch([token])[0]
+
+    def decrypt_json_batch(self, tokens: list) -> list:
+        """decrypt_json over many tokens, order preserved.
+
+        Parses the decrypted bytes directly, skipping the intermediate str
+        per row.
+        """
+        results = []
+        for plain in self._decrypt_raw_batch(tokens):
+            if plain == b"":
+                results.append({})
+                continue
+            try:
+                results.append(orjson.loads(plain))
+            except (TypeError, orjson.JSONDecodeError):
+                results.append(None)
+        return results
 
     # --- AUTHENTICATION ---
+    # bcrypt only uses the first 72 bytes; truncate explicitly as passlib did
     def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode()[:72], salt).decode()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode()[:72], hashed_password.encode()
+            )
+        except (ValueError, AttributeError):
+            # Malformed or missing stored hash
+            return False
 
     def create_access_token(self, data: dict):
         to_encode = data.copy()
@@ -91,32 +158,59 @@ class GovernanceAgent:
         to_encode.update({"exp": expire})
         return jwt.encode(to_encode, self.jwt_secret, algorithm=self.jwt_algorithm)
 
-    def verify_token(self, token: str):
-        try:
-            payload = jwt.decode(
-                token, self.jwt_secret, algorithms=[self.jwt_algorithm]
-            )
+    @staticmethod
+    def _token_blacklist():
+        """Redis client holding revoked jtis, or None when Redis is off."""
+        from intelligence.inference_cache import inference_cache
 
-            # Security Hardening: Check Redis Blacklist
-            jti = payload.get("jti")
-            if jti:
-                from intelligence.inference_cache import inference_cache
+        return inference_cache._redis if inference_cache._enabled else None
 
-                if inference_cache._enabled:
-                    if inference_cache._redis.exists(f"token_blacklist:{jti}"):
-                        logger.warning(
-                            f"SECURITY: Blocked attempt to use revoked token {jti}"
-                        )
-                        return None
-
-            return payload
-        except jwt.ExpiredSignatureError:
-            return None
-        except jwt.InvalidTokenError:
+    def cached_token_payload(self, token: str):
+        """
+        Payload of a recently verified token, or None (cheap, no I/O).
+        With the Redis blacklist on, a revocation from another worker must be
+        seen, so this always returns None and callers go through verify_token.
+        """
+        if self._token_blacklist() is not None:
             return None
+        with _verified_tokens_lock:
+            return _verified_tokens.get(token)
+
+    def verify_token(self, token: str):
+        # The cache only saves the signature check; revocation is checked on
+        # every call
+        with _verified_tokens_lock:
+            payload = _verified_tokens.get(token)
+        cached = payload is not None
+        if not cached:
+            try:
+                payload = jwt.decode(
+                    token, self.jwt_secret, algorithms=[self.jwt_algorithm]
+                )
+            except jwt.ExpiredSignatureError:
+                return None
+            except jwt.InvalidTokenError:
+                return None
+
+        # Security Hardening: Check Redis Blacklist
+        jti = payload.get("jti")
+        blacklist = self._token_blacklist()
+        if jti and blacklist is not None:
+            if blacklist.exists(f"token_blacklist:{jti}"):
+                logger.warning(f"SECURITY: Blocked attempt to use revoked token {jti}")
+                with _verified_tokens_lock:
+                    _verified_tokens.pop(token, None)
+                return None
+
+        if not cached:
+            with _verified_tokens_lock:
+                _verified_tokens[token] = payload
+        return payload
 
     def revoke_token(self, token: str):
         """Standard Logout: Add token to blacklist until it expires."""
+        with _verified_tokens_lock:
+            _verified_tokens.pop(token, None)
         try:
             payload = jwt.decode(
                 token, self.jwt_secret, algorithms=[self.jwt_algorithm]
@@ -267,16 +361,22 @@ class GovernanceAgent:
         pass  # No persistent session to close
 
     # --- AUDIT EVIDENCE SIGNING ---
-    def sign_evidence(self, payload: str) -> str:
+    def sign_evidence(self, payload: Union[str, bytes]) -> str:
         """
         Create HMAC-SHA256 signature for evidence payload using AUDIT_SIGNING_KEY.
+        Pass canonical bytes (see canonical_evidence) to sign without re-encoding.
         """
         key = os.getenv("AUDIT_SIGNING_KEY") or getattr(
             settings, "AUDIT_SIGNING_KEY", None
         )
         if not key:
             raise RuntimeError("AUDIT_SIGNING_KEY not configured")
-        sig = hmac.new(
-            key.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256
-        ).hexdigest()
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        sig = hmac.new(key.encode("utf-8"), payload, hashlib.sha256).hexdigest()
         return sig
+
+    @staticmethod
+    def canonical_evidence(data) -> bytes:
+        """Compact, key-sorted JSON bytes so a signature is stable across runs."""
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str)
@@ -19,15 +19,29 @@ class HumanReviewAgent:
     def __init__(self):
         self.governance = GovernanceAgent()
 
-    def get_flagged_interactions(self):
-        """Retrieve items requiring human review."""
+    def get_flagged_interactions(self, limit=None, before_id=None):
+        """Retrieve items requiring human review (only the columns the queue shows).
+
+        Newest first; pass the last id seen as ``before_id`` to fetch the next page.
+        """
         db = SessionLocal()
         try:
-            return (
-                db.query(Interaction)
+            query = (
+                db.query(
+                    Interaction.id,
+                    Interaction.session_id,
+                    Interaction.user_input_encrypted,
+                    Interaction.diagnosis_output_encrypted,
+                    Interaction.timestamp,
+                )
                 .filter(Interaction.requires_human_review == True)
-                .all()
+                .order_by(Interaction.id.desc())
             )
+            if before_id is not None:
+                query = query.filter(Interaction.id < before_id)
+            if limit is not None:
+                query = query.limit(limit)
+            return query.all()
         except Exception as e:
             logger.error(f"Failed to fetch flagged items: {e}")
             return []
@@ -29,7 +29,7 @@ class ABTester:
             api_key=settings.OPENAI_API_KEY,
         )
 
-    def run_comparison(
+    async def run_comparison_async(
         self,
         prompt_id: str,
         prompt_a_content: str,
@@ -38,6 +38,7 @@ class ABTester:
     ):
         """
         Runs both prompt versions against test cases and identifies a winner.
+        The final evaluation awaits the model instead of blocking the event loop.
         """
         logger.info(f"--- A/B TEST: COMPARING TWO VERSIONS OF {prompt_id} ---")
 
@@ -52,34 +53,38 @@ class ABTester:
                 {"case": case["id"], "results_a": res_a, "results_b": res_b}
             )
 
-        # Final Evaluation via LLM
+        messages = self._evaluation_messages(comparison_results)
+        if messages is None:
+            return {"error": "A/B Evaluation prompt not found."}
+
+        try:
+            response = await self.llm.ainvoke(messages)
+            return self._parse_outcome(response.content)
+        except Exception as e:
+            logger.error(f"A/B Test error: {e}")
+            return {"error": str(e)}
+
+    def _evaluation_messages(self, comparison_results: List[Dict[str, Any]]):
+        """Builds the auditor prompt for the final LLM evaluation."""
         eval_prompt_entry = PROMPT_REGISTRY.get("MED-AB-EVAL-001")
         if not eval_prompt_entry:
-            return {"error": "A/B Evaluation prompt not found."}
+            return None
 
         eval_prompt = (
             eval_prompt_entry.content
             + f"\n\nDATA:\n{json.dumps(comparison_results, indent=2)}"
         )
-
-        try:
-            response = self.llm.invoke(
-                [
-                    SystemMessage(content="You are a Clinical Trials Data Auditor."),
-                    HumanMessage(content=eval_prompt),
-                ]
-            )
-
-            content = response.content
-            if "{" in content:
-                start = content.find("{")
-                end = content.rfind("}") + 1
-                return json.loads(content[start:end])
-            return {"raw_outcome": content}
-
-        except Exception as e:
-            logger.error(f"A/B Test error: {e}")
-            return {"error": str(e)}
+        return [
+            SystemMessage(content="You are a Clinical Trials Data Auditor."),
+            HumanMessage(content=eval_prompt),
+        ]
+
+    def _parse_outcome(self, content: str) -> Dict[str, Any]:
+        if "{" in content:
+            start = content.find("{")
+            end = content.rfind("}") + 1
+            return json.loads(content[start:end])
+        return {"raw_outcome": content}
 
     def _sim_invoke(self, content: str, case: Dict[str, Any]) -> str:
         """
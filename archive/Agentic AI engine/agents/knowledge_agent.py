@@ -3,6 +3,7 @@ Knowledge Agent - Wrapper around Medical Retriever.
 Optimized for performance with lazy imports.
 """
 
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,17 +37,19 @@ class KnowledgeAgent:
 
             # Fetch EMR Context
             fhir = FHIRConnector(base_url=settings.FHIR_BASE_URL)
+            retriever = self.get_retriever()
             # In production, we'd use the current user's token
-            conditions = await fhir.get_conditions(patient_id)
-            meds = await fhir.get_medications(patient_id)
+            # Both EMR fetches and the (blocking) RAG lookup run concurrently
+            conditions, meds, knowledge = await asyncio.gather(
+                fhir.get_conditions(patient_id),
+                fhir.get_medications(patient_id),
+                asyncio.to_thread(retriever.retrieve, patient_summary),
+            )
 
             ehr_context = (
                 f"EMR CONDITIONS: {str(conditions)}\nEMR MEDICATIONS: {str(meds)}"
             )
 
-            retriever = self.get_retriever()
-            knowledge = retriever.retrieve(patient_summary)
-
             # Clinical Knowledge Verification (Feature 5)
             # Ensure sources are from WHO, NIH, or PubMed
             trusted_domains = ["who.int", "nih.gov", "pubmed", "cdc.gov"]
@@ -1,11 +1,16 @@
+import asyncio
 import datetime
 import hashlib
 import json
 import logging
 import os
+import secrets
+import threading
 import uuid
 
-from sqlalchemy import delete, func, select
+import orjson
+from cachetools import LRUCache
+from sqlalchemy import delete, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from agents.audit_agent import AuditAgent
@@ -17,9 +22,12 @@ from database.models import (AsyncSessionLocal, Feedback, Interaction,
                              PatientProfile, SessionLocal, SymptomLog,
                              SystemLog, UserAccount, UserAction, UserActivity,
                              UserRole, UserSession)
+from utils.list_cache import invalidate_user_lists
 
 logger = logging.getLogger(__name__)
 
+REPORT_PLAINTEXT_CACHE_SIZE = 512
+
 
 class PersistenceAgent:
     """
@@ -31,12 +39,33 @@ class PersistenceAgent:
         self.governance = GovernanceAgent()
         self.audit = AuditAgent()
         self.db = SessionLocal()  # Legacy sync support for older routes
+        # Decrypted report JSON by (report id, generated_at); reports are immutable
+        self._report_plaintext = LRUCache(maxsize=REPORT_PLAINTEXT_CACHE_SIZE)
+        self._report_plaintext_lock = threading.Lock()
+
+    def decrypt_report(self, report: MedicalReport) -> dict:
+        """Decrypt and parse a report's content, reusing recently decrypted plaintext.
+
+        Only the plaintext string is cached, so every caller gets its own dict.
+        """
+        key = (report.id, report.generated_at)
+        with self._report_plaintext_lock:
+            plain = self._report_plaintext.get(key)
+        if plain is not None:
+            return orjson.loads(plain)
+
+        plain = self.governance.decrypt(report.report_content_encrypted)
+        content = orjson.loads(plain)  # raises before caching unreadable content
+        with self._report_plaintext_lock:
+            self._report_plaintext[key] = plain
+        return content
 
     async def create_session(
         self, user_id: str = "guest", mode: str = "patient"
     ) -> str:
         """Start a new tracking session (Async)."""
-        session_id = str(uuid.uuid4())
+        # Per-consult id: one urandom read, no UUID object
+        session_id = secrets.token_hex(16)
         async with AsyncSessionLocal() as db:
             try:
                 new_session = UserSession(
@@ -163,14 +192,16 @@ class PersistenceAgent:
                         }
                 except Exception:
                     pass
-                log_entry = SystemLog(
-                    level=level,
-                    component=component,
-                    message=redacted_message,
-                    details=redacted_details,
-                    session_id=session_id,
+                # Write-only table: a Core INSERT skips ORM object construction
+                await db.execute(
+                    insert(SystemLog).values(
+                        level=level,
+                        component=component,
+                        message=redacted_message,
+                        details=redacted_details,
+                        session_id=session_id,
+                    )
                 )
-                db.add(log_entry)
                 await db.commit()
             except Exception as e:
                 logger.error(f"DB Logging failed: {e}")
@@ -394,6 +425,7 @@ AI Diagnosis: {diag}\
                 )
                 db.add(new_report)
                 await db.commit()
+                invalidate_user_lists(patient_id)
                 return new_report.id
             except Exception as e:
                 logger.error(f"Failed to save medical report: {e}")
@@ -430,6 +462,7 @@ AI Diagnosis: {diag}\
                 )
                 db.add(new_image)
                 await db.commit()
+                invalidate_user_lists(patient_id)
                 return new_image.id
             except Exception as e:
                 logger.error(f"Failed to save medical image: {e}")
@@ -477,14 +510,15 @@ AI Diagnosis: {diag}\
         """Save a granular user UI action (Async)."""
         async with AsyncSessionLocal() as db:
             try:
-                action = UserAction(
-                    session_id=session_id,
-                    action_type=action_type,
-                    element_id=element_id,
-                    details=details or {},
-                    audit_tag=audit_tag,
+                await db.execute(
+                    insert(UserAction).values(
+                        session_id=session_id,
+                        action_type=action_type,
+                        element_id=element_id,
+                        details=details or {},
+                        audit_tag=audit_tag,
+                    )
                 )
-                db.add(action)
                 await db.commit()
                 return True
             except Exception as e:
@@ -512,7 +546,9 @@ AI Diagnosis: {diag}\
         async with AsyncSessionLocal() as db:
             try:
                 user_id = str(uuid.uuid4())
-                hashed_pwd = self.governance.hash_password(password)
+                hashed_pwd = await asyncio.to_thread(
+                    self.governance.hash_password, password
+                )
                 enc_name = self.governance.encrypt(full_name)
                 enc_meta = self.governance.encrypt(str(meta or {}))
 
@@ -599,10 +635,14 @@ AI Diagnosis: {diag}\
         """Find user by login ID (Async)."""
         async with AsyncSessionLocal() as db:
             try:
-                stmt = select(UserAccount).filter(
-                    (UserAccount.username == login_id)
-                    | (UserAccount.email == login_id)
-                    | (UserAccount.phone == login_id)
+                stmt = (
+                    select(UserAccount)
+                    .filter(
+                        (UserAccount.username == login_id)
+                        | (UserAccount.email == login_id)
+                        | (UserAccount.phone == login_id)
+                    )
+                    .limit(1)
                 )
                 res = await db.execute(stmt)
                 return res.scalars().first()
@@ -610,6 +650,27 @@ AI Diagnosis: {diag}\
                 logger.error(f"User lookup failed: {e}")
                 return None
 
+    async def user_exists_any(self, username: str, email: str, phone: str) -> bool:
+        """Check username/email/phone for an existing account in one query (Async)."""
+        async with AsyncSessionLocal() as db:
+            try:
+                stmt = (
+                    select(UserAccount.id)
+                    .filter(
+                        or_(
+                            UserAccount.username == username,
+                            UserAccount.email == email,
+                            UserAccount.phone == phone,
+                        )
+                    )
+                    .limit(1)
+                )
+                res = await db.execute(stmt)
+                return res.first() is not None
+            except Exception as e:
+                logger.error(f"User existence check failed: {e}")
+                return False
+
     async def get_user_by_clerk_id(self, clerk_id: str):
         """Find user by Clerk ID (Async)."""
         async with AsyncSessionLocal() as db:
@@ -721,22 +782,22 @@ AI Diagnosis: {diag}\
             return ""
         async with AsyncSessionLocal() as db:
             try:
+                # Only the two columns the prompt uses; no ORM identity map work
                 stmt = (
-                    select(MemoryNode)
+                    select(MemoryNode.node_type, MemoryNode.content_encrypted)
                     .filter(MemoryNode.user_id == user_id)
                     .order_by(MemoryNode.created_at.desc())
                     .limit(15)
                 )
-                res = await db.execute(stmt)
-                nodes = res.scalars().all()
-                graph_text = "\
-[USER MEMORY GRAPH - RELEVANT NODES]:\
-"
-                for node in nodes:
-                    content = self.governance.decrypt(node.content_encrypted)
-                    graph_text += f"- ({node.node_type}): {content[:200]}...\
-"
-                return graph_text
+                rows = (await db.execute(stmt)).all()
+                contents = await asyncio.to_thread(
+                    self.governance.decrypt_batch,
+                    [row.content_encrypted for row in rows],
+                )
+                return "[USER MEMORY GRAPH - RELEVANT NODES]:" + "".join(
+                    f"- ({row.node_type}): {content[:200]}..."
+                    for row, content in zip(rows, contents)
+                )
             except Exception as e:
                 logger.error(f"Graph retrieval failed: {e}")
                 return ""
@@ -1,8 +1,10 @@
-import json
 import logging
 import os
+from pathlib import Path
 from typing import Dict, Optional
 
+import orjson
+
 from agents.prompts.registry import PROMPT_REGISTRY, PromptEntry
 
 logger = logging.getLogger(__name__)
@@ -30,9 +32,8 @@ class DynamicPromptManager:
         for filename in os.listdir(self.override_dir):
             if filename.endswith(".json"):
                 try:
-                    with open(os.path.join(self.override_dir, filename), "r") as f:
-                        data = json.load(f)
-                        self.overrides.update(data)
+                    path = Path(self.override_dir, filename)
+                    self.overrides.update(orjson.loads(path.read_bytes()))
                 except Exception as e:
                     logger.error(f"Failed to load prompt override {filename}: {e}")
         logger.info(f"Loaded {len(self.overrides)} dynamic prompt overrides.")
@@ -50,17 +51,15 @@ class DynamicPromptManager:
     def save_override(self, prompt_id: str, new_content: str):
         """Save a new prompt version to overrides (Triggered by RLHF Pipeline)."""
         self.overrides[prompt_id] = new_content
-        override_file = os.path.join(self.override_dir, "rlhf_improvements.json")
+        override_file = Path(self.override_dir, "rlhf_improvements.json")
 
-        # Load existing, update, and save
+        # Load existing, update, and save in a single write
         data = {}
-        if os.path.exists(override_file):
-            with open(override_file, "r") as f:
-                data = json.load(f)
+        if override_file.exists():
+            data = orjson.loads(override_file.read_bytes())
 
         data[prompt_id] = new_content
-        with open(override_file, "w") as f:
-            json.dump(data, f, indent=4)
+        override_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         logger.info(f"Saved prompt override for {prompt_id}.")
 
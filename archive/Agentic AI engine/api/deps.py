@@ -1,10 +1,18 @@
+import hmac
 import logging
+import threading
 import uuid
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import (APIKeyHeader, HTTPAuthorizationCredentials,
+                              HTTPBearer, OAuth2PasswordBearer)
 from jose import jwt
+from langchain_openai import ChatOpenAI
+from sqlalchemy.orm import raiseload
 
 from agents.audit_agent import AuditAgent
 from agents.authentication_agent import AuthenticationAgent
@@ -37,12 +45,17 @@ def check_admin_auth(api_key: str = Depends(api_key_header)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Server misconfigured: ADMIN_API_KEY missing",
         )
-    if api_key != expected_key:
+    # Constant-time compare so response timing doesn't leak key prefixes
+    if not api_key or not hmac.compare_digest(
+        api_key.encode(), expected_key.encode()
+    ):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Auth Failed")
     return True
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+# Plain "Authorization: Bearer" extraction for get_current_user; /auth/login is unchanged
+bearer_scheme = HTTPBearer(auto_error=False)
 
 
 async def verify_clerk_token(token: str):
@@ -57,137 +70,135 @@ async def verify_clerk_token(token: str):
 
 
 # Singletons
-_orchestrator = None
-_persistence = None
-_governance = None
-_improver = None
-_developer_agent = None
-_auth_agent = None
-_review_agent = None
-_medication_agent = None
-_report_agent = None
-_calendar_agent = None
-_verification_agent = None
-_generative_engine = None
-_interop_builder = None
-_audit_agent = None
-_export_agent = None
+_instances = {}
+# One lock per class, so different agents can be constructed concurrently (startup
+# warmup builds them in parallel). Constructors that resolve other singletons take
+# those locks in dependency order, which has no cycles.
+_locks = {}
+
+
+def lazy_singleton(cls):
+    """Return the process-wide instance of ``cls``, constructing it at most once."""
+    instance = _instances.get(cls)
+    if instance is None:
+        with _locks.setdefault(cls, threading.RLock()):
+            instance = _instances.get(cls)
+            if instance is None:
+                instance = _instances[cls] = cls()
+    return instance
 
 
 def get_persistence():
-    global _persistence
-    if _persistence is None:
-        _persistence = PersistenceAgent()
-    return _persistence
+    return lazy_singleton(PersistenceAgent)
 
 
 def get_governance():
-    global _governance
-    if _governance is None:
-        _governance = GovernanceAgent()
-    return _governance
+    return lazy_singleton(GovernanceAgent)
 
 
 def get_orchestrator():
-    global _orchestrator
-    if _orchestrator is None:
-        _orchestrator = MedAgentOrchestrator()
-    return _orchestrator
+    return lazy_singleton(MedAgentOrchestrator)
 
 
 def get_auth_agent():
-    global _auth_agent
-    if _auth_agent is None:
-        _auth_agent = AuthenticationAgent()
-    return _auth_agent
+    return lazy_singleton(AuthenticationAgent)
 
 
 # Add others as needed
 def get_verification_agent():
-    global _verification_agent
-    if _verification_agent is None:
-        _verification_agent = VerificationAgent()
-    return _verification_agent
+    return lazy_singleton(VerificationAgent)
 
 
 def get_improver():
-    global _improver
-    if _improver is None:
-        _improver = SelfImprovementAgent()
-    return _improver
+    return lazy_singleton(SelfImprovementAgent)
 
 
 def get_developer_agent():
-    global _developer_agent
-    if _developer_agent is None:
-        _developer_agent = DeveloperControlAgent()
-    return _developer_agent
+    return lazy_singleton(DeveloperControlAgent)
 
 
 def get_review_agent():
-    global _review_agent
-    if _review_agent is None:
-        _review_agent = HumanReviewAgent()
-    return _review_agent
+    return lazy_singleton(HumanReviewAgent)
 
 
 def get_medication_agent():
-    global _medication_agent
-    if _medication_agent is None:
-        _medication_agent = MedicationAgent()
-    return _medication_agent
+    return lazy_singleton(MedicationAgent)
 
 
 def get_report_agent():
-    global _report_agent
-    if _report_agent is None:
-        _report_agent = ReportAgent()
-    return _report_agent
+    return lazy_singleton(ReportAgent)
 
 
 def get_calendar_agent():
-    global _calendar_agent
-    if _calendar_agent is None:
-        _calendar_agent = CalendarAgent()
-    return _calendar_agent
+    return lazy_singleton(CalendarAgent)
 
 
 def get_generative_engine():
-    global _generative_engine
-    if _generative_engine is None:
-        _generative_engine = GenerativeEngineAgent()
-    return _generative_engine
+    return lazy_singleton(GenerativeEngineAgent)
 
 
 def get_interop_builder():
-    global _interop_builder
-    if _interop_builder is None:
-        _interop_builder = InteropBuilder()
-    return _interop_builder
+    return lazy_singleton(InteropBuilder)
 
 
 def get_audit_agent():
-    global _audit_agent
-    if _audit_agent is None:
-        _audit_agent = AuditAgent()
-    return _audit_agent
+    return lazy_singleton(AuditAgent)
 
 
 def get_export_agent():
-    global _export_agent
-    if _export_agent is None:
-        _export_agent = ExportAgent()
-    return _export_agent
+    return lazy_singleton(ExportAgent)
+
+
+@lru_cache(maxsize=1)
+def get_chat_llm():
+    """Shared deterministic chat model for the single-prompt routes.
+
+    Built on first use so a missing OPENAI_API_KEY does not break app import; the
+    instance is reused so its HTTP connection pool stays warm across requests.
+    """
+    return ChatOpenAI(
+        model=settings.OPENAI_MODEL, temperature=0.0, api_key=settings.OPENAI_API_KEY
+    )
+
+
+# Keyset pagination for newest-first listings: ?limit=&cursor=<last id seen>
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def keyset_page(rows, limit: int):
+    """Trim a ``limit + 1`` row fetch to one page; returns (page, next_cursor)."""
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+
+def orm_load_options():
+    """Loader options for ORM row fetches in routes.
+
+    With STRICT_ORM_LOADING on (dev/tests), touching a relationship that was not
+    eager-loaded raises instead of silently issuing one more query per row.
+    """
+    return (raiseload("*"),) if settings.STRICT_ORM_LOADING else ()
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+):
+    token = creds.credentials if creds else None
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token"
         )
 
     gov = get_governance()
-    payload = gov.verify_token(token)
+    # Recently verified tokens skip the signature check and the threadpool hop
+    # (without the Redis blacklist; with it, verify_token rechecks revocation)
+    payload = gov.cached_token_payload(token)
+    if payload is None:
+        # JWT decode + revocation lookup are blocking; keep them off the event loop
+        payload = await run_in_threadpool(gov.verify_token, token)
     if payload:
         return payload
 
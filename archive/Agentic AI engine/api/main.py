@@ -7,25 +7,20 @@ Updated for Feedback, Review, and Medical Image Analysis.
 import sys
 
 print("DEBUG: Importing api.main", file=sys.stderr)
+import asyncio
 import datetime
-import json
+import hashlib
 import logging
 import os
-import uuid
+import queue
+import secrets
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import bcrypt
-
-# Monkeypatch bcrypt for passlib compatibility in newer versions
-if not hasattr(bcrypt, "__about__"):
-
-    class BcryptAbout:
-        __version__ = getattr(bcrypt, "__version__", "unknown")
-
-    bcrypt.__about__ = BcryptAbout()
-
+import aiofiles
+import anyio
+import orjson
 
 _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
@@ -34,18 +29,29 @@ if str(_root) not in sys.path:
 import time
 
 import httpx
+import openai
 from fastapi import (Depends, FastAPI, File, HTTPException, Request,
                      UploadFile, WebSocket, WebSocketDisconnect)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
+from langchain_core.messages import HumanMessage, SystemMessage
 from prometheus_client import (CONTENT_TYPE_LATEST, Counter, Gauge, Histogram,
                                generate_latest)
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from agents.orchestrator import MedAgentOrchestrator
 from agents.persistence_agent import PersistenceAgent
+from agents.prompts.registry import PROMPT_REGISTRY
 from config import settings
+from database.models import Interaction
+from database.models import engine as db_engine
+from database.models import get_async_db
+from utils import response_cache
 from utils.rate_limit import check_rate_limit, get_client_identifier
 from utils.safety import sanitize_input, validate_medical_input
 
@@ -66,23 +72,65 @@ CLINICAL_ERROR_RATE = Counter(
 from fastapi.responses import Response
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import (ConsoleSpanExporter,
-                                            SimpleSpanProcessor)
+from opentelemetry.sdk.trace.export import (BatchSpanProcessor,
+                                            ConsoleSpanExporter)
 
 logger = logging.getLogger(__name__)
 
 from api.deps import (check_admin_auth, get_audit_agent, get_auth_agent,
-                      get_calendar_agent, get_current_user,
+                      get_calendar_agent, get_chat_llm, get_current_user,
                       get_developer_agent, get_export_agent,
                       get_generative_engine, get_governance, get_improver,
                       get_interop_builder, get_medication_agent,
                       get_orchestrator, get_persistence, get_report_agent,
-                      get_review_agent, get_verification_agent, oauth2_scheme)
+                      get_review_agent, get_verification_agent, oauth2_scheme,
+                      orm_load_options)
 from api.routes import (analytics, auth, clinical, docs, ehr, feedback,
                         governance, imaging, learning, medications, patient,
                         pediatric, system)
 from api.ws_manager import manager
 
+# Agents constructed at startup so the first request doesn't pay for init
+WARMUP_FACTORIES = (
+    get_orchestrator,
+    get_persistence,
+    get_governance,
+    get_improver,
+    get_developer_agent,
+    get_auth_agent,
+    get_review_agent,
+    get_medication_agent,
+    get_report_agent,
+    get_calendar_agent,
+    get_verification_agent,
+    get_interop_builder,
+)
+# /ready stays 503 unless these came up; the rest only degrade their own routes
+READINESS_FACTORIES = (
+    get_orchestrator,
+    get_persistence,
+    get_governance,
+    get_auth_agent,
+)
+
+
+async def warm_singletons():
+    """Construct agent singletons in parallel worker threads.
+
+    Returns the names of factories that failed; failures are logged, not raised,
+    so the process stays up for metrics and health probes.
+    """
+    results = await asyncio.gather(
+        *(run_in_threadpool(factory) for factory in WARMUP_FACTORIES),
+        return_exceptions=True,
+    )
+    failed = []
+    for factory, result in zip(WARMUP_FACTORIES, results):
+        if isinstance(result, Exception):
+            logger.critical(f"STARTUP: {factory.__name__} failed to initialize: {result}")
+            failed.append(factory.__name__)
+    return failed
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -94,12 +142,22 @@ async def lifespan(app: FastAPI):
         logger.critical("PRODUCTION BLOCKER: JWT_SECRET_KEY is missing.")
     if not settings.DATA_ENCRYPTION_KEY:
         logger.critical("PRODUCTION BLOCKER: DATA_ENCRYPTION_KEY is missing.")
+    # AnyIO defaults to 40 threads; blocking crypto and report rendering share them
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        settings.THREADPOOL_SIZE
+    )
+    app.state.warmup_failures = await warm_singletons()
     yield
     logger.info("Shutting down MedAgent Global System...")
+    # Each worker process owns its pool; close its connections on the way out
+    await db_engine.dispose()
 
 
 app = FastAPI(
-    title="MedAgent Global System", version="5.4.0-GOLD-READY", lifespan=lifespan
+    title="MedAgent Global System",
+    version="5.4.0-GOLD-READY",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -118,6 +176,8 @@ app.include_router(analytics.router)
 app.include_router(pediatric.router)
 app.include_router(medications.router)
 
+# Compress JSON/CSV bodies over 500 bytes; level 5 keeps CPU cost per response low
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ALLOWED_ORIGINS,
@@ -136,29 +196,70 @@ REQUEST_ERRORS = Counter("medagent_request_errors_total", "Total request errors"
 ESCALATIONS = Counter("medagent_escalations_total", "Total critical escalations")
 MODEL_USAGE = Counter("medagent_model_usage_total", "Model usage counter", ["model"])
 
-# Minimal OpenTelemetry setup (console exporter)
+
+class RequestMetricsMiddleware:
+    """Pure-ASGI timer feeding REQUEST_LATENCY / REQUEST_ERRORS for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            REQUEST_ERRORS.inc()
+            raise
+        finally:
+            REQUEST_LATENCY.observe((time.perf_counter() - t0) * 1000)
+
+
+app.add_middleware(RequestMetricsMiddleware)
+
+# OpenTelemetry: spans are batched and exported off the request path.
+# OTLP when an endpoint is configured, console only when explicitly enabled.
 try:
     trace.set_tracer_provider(TracerProvider())
     tracer_provider = trace.get_tracer_provider()
-    tracer_provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    if settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import \
+            OTLPSpanExporter
+
+        tracer_provider.add_span_processor(
+            BatchSpanProcessor(
+                OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)
+            )
+        )
+    if settings.OTEL_CONSOLE_EXPORT:
+        tracer_provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
     tracer = trace.get_tracer("medagent.api")
-except Exception:
+except Exception as e:
+    logger.warning(f"OpenTelemetry setup failed, tracing disabled: {e}")
     tracer = None
 
 
+# Static probe bodies, serialized once at import
+ROOT_JSON = orjson.dumps({"status": "Online", "version": "5.4.0-GOLD-READY"})
+HEALTH_JSON = orjson.dumps({"status": "ok", "version": "5.4.0-GOLD-READY"})
+LIVE_JSON = orjson.dumps({"status": "live"})
+
+
 @app.get("/")
 async def root():
-    return {"status": "Online", "version": "5.4.0-GOLD-READY"}
+    return Response(ROOT_JSON, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "version": "5.4.0-GOLD-READY"}
+    return Response(HEALTH_JSON, media_type="application/json")
 
 
 @app.get("/health/live")
 async def health_live():
-    return {"status": "live"}
+    return Response(LIVE_JSON, media_type="application/json")
 
 
 @app.get("/health/ready")
@@ -173,55 +274,103 @@ async def metrics():
 
 @app.get("/ready")
 async def ready():
-    try:
-        orch = get_orchestrator()
-        if orch:
+    # Ready only once lifespan warmup has built the core agents; never build here
+    failures = getattr(app.state, "warmup_failures", None)
+    if failures is not None:
+        blocking = [f.__name__ for f in READINESS_FACTORIES if f.__name__ in failures]
+        if not blocking:
             return {"status": "ready", "version": "5.3.0"}
-    except Exception:
-        pass
+    else:
+        blocking = ["warmup_pending"]
 
-    return JSONResponse(
-        status_code=503, content={"status": "not_ready", "version": "5.3.0"}
+    return ORJSONResponse(
+        status_code=503,
+        content={"status": "not_ready", "version": "5.3.0", "failed": blocking},
     )
 
 
 UPLOAD_DIR = _root / "data" / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-ALLOWED_IMAGE_FORMATS = ["jpg", "jpeg", "png", "webp", "heic", "dicom", "dcm"]
+ALLOWED_IMAGE_FORMATS = frozenset(
+    {"jpg", "jpeg", "png", "webp", "heic", "dicom", "dcm"}
+)
+_UNSUPPORTED_FORMAT_MSG = (
+    f"Unsupported format. Allowed: {', '.join(sorted(ALLOWED_IMAGE_FORMATS))}"
+)
 MAX_UPLOAD_SIZE = 20 * 1024 * 1024  # 20MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+UPLOAD_BUFFER_POOL_MAX = 64  # caps idle pooled memory at 64MB
+
+# Reused chunk buffers, so sustained uploads don't allocate and free 1MB per read
+_upload_buffer_pool = queue.SimpleQueue()
+
+
+def _rent_upload_buffer() -> bytearray:
+    try:
+        return _upload_buffer_pool.get_nowait()
+    except queue.Empty:
+        return bytearray(UPLOAD_CHUNK_SIZE)
+
+
+def _release_upload_buffer(buf: bytearray) -> None:
+    if _upload_buffer_pool.qsize() < UPLOAD_BUFFER_POOL_MAX:
+        _upload_buffer_pool.put(buf)
+
+
+def _private_opener(path, flags):
+    """Create uploaded PHI files readable by the service user only."""
+    return os.open(path, flags, 0o600)
 
 
 @app.post("/upload")
 async def upload_image(file: UploadFile = File(...)):
     """Securely upload a medical image with metadata storage."""
     try:
-        file_ext = file.filename.split(".")[-1].lower()
+        file_ext = os.path.splitext(file.filename or "")[1].lstrip(".").lower()
         if file_ext not in ALLOWED_IMAGE_FORMATS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported format. Allowed: {', '.join(ALLOWED_IMAGE_FORMATS)}",
-            )
-
-        # Read file content
-        content = await file.read()
-
-        # Validate file size
-        if len(content) > MAX_UPLOAD_SIZE:
-            raise HTTPException(
-                status_code=400, detail="File too large. Maximum 20MB allowed."
-            )
+            raise HTTPException(status_code=400, detail=_UNSUPPORTED_FORMAT_MSG)
 
-        file_name = f"{uuid.uuid4()}.{file_ext}"
+        file_name = f"{secrets.token_urlsafe(16)}.{file_ext}"
         file_path = UPLOAD_DIR / file_name
 
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # Stream to disk in fixed-size chunks so memory stays flat per upload;
+        # size and digest are computed in the same pass
+        size_bytes = 0
+        digest = hashlib.sha256()
+        buf = _rent_upload_buffer()
+        view = memoryview(buf)
+        created = False
+        try:
+            # "xb" is O_CREAT|O_EXCL: never overwrite an existing upload
+            async with aiofiles.open(file_path, "xb", opener=_private_opener) as f:
+                created = True
+                while n := await run_in_threadpool(file.file.readinto, buf):
+                    size_bytes += n
+                    if size_bytes > MAX_UPLOAD_SIZE:
+                        break
+                    digest.update(view[:n])
+                    await f.write(view[:n])
+
+            # Validate file size
+            if size_bytes > MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=400, detail="File too large. Maximum 20MB allowed."
+                )
+        except BaseException:
+            # Oversize, I/O error or cancellation: never leave a partial file
+            if created:
+                file_path.unlink(missing_ok=True)
+            raise
+        finally:
+            view.release()
+            _release_upload_buffer(buf)
 
         return {
             "image_path": str(file_path),
             "filename": file.filename,
-            "size_bytes": len(content),
+            "size_bytes": size_bytes,
+            "sha256": digest.hexdigest(),
             "format": file_ext,
         }
     except HTTPException:
@@ -230,150 +379,165 @@ async def upload_image(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+# Static bilingual agent/capability catalogue served by /system/capabilities
+CAPABILITIES = {
+    "agents": [
+        {
+            "name": "Triage Agent / عميل الفرز",
+            "role": "Analyzes symptoms and severity / يحلل الأعراض والخطورة",
+        },
+        {
+            "name": "Knowledge Agent / عميل المعرفة",
+            "role": "Retrieves medical literature via RAG / يسترجع الأدبيات الطبية",
+        },
+        {
+            "name": "Reasoning Agent / عميل التفكير",
+            "role": "Performs differential analysis / يقوم بالتحليل التفريقي",
+        },
+        {
+            "name": "Safety Agent / عميل السلامة",
+            "role": "Check for errors and safety / يتحقق من الأخطاء والسلامة",
+        },
+        {
+            "name": "Validation Agent / عميل التحقق",
+            "role": "Verifies medical accuracy / يتحقق من الدقة الطبية",
+        },
+        {
+            "name": "Vision Analysis Agent / عميل تحليل الصور",
+            "role": "Analyzes medical images (X-ray, Rashes, etc.) / يحلل الصور الطبية (الأشعة، الأمراض الجلدية، إلخ)",
+        },
+        {
+            "name": "Patient Agent / عميل المريض",
+            "role": "Manages patient profile and history / يدير ملف المريض وتاريخه",
+        },
+        {
+            "name": "Report Agent / عميل التقارير",
+            "role": "Generates medical reports / ينشئ التقارير الطبية",
+        },
+        {
+            "name": "Calendar Agent / عميل التقويم",
+            "role": "Manages appointments / يدير المواعيد",
+        },
+        {
+            "name": "Supervisor Agent / عميل الإشراف",
+            "role": "Monitors system health / يراقب صحة النظام",
+        },
+        {
+            "name": "Self-Improvement Agent / عميل التحسين الذاتي",
+            "role": "Learns from feedback / يتعلم من التعليقات",
+        },
+        {
+            "name": "Developer Control Agent / عميل التحكم المطور",
+            "role": "System management for devs / إدارة النظام للمطورين",
+        },
+        {
+            "name": "Medication Agent / عميل الأدوية",
+            "role": "Tracks dosages and reminders / يتتبع الجرعات والتذكيرات",
+        },
+        {
+            "name": "Second Opinion Agent / عميل الرأي الثاني",
+            "role": "Independent diagnostic audit / تدقيق تشخيصي مستقل",
+        },
+        {
+            "name": "Human Review Agent / عميل المراجعة البشرية",
+            "role": "Clinician-in-the-loop audit / مراجعة الطبيب المختص",
+        },
+        {
+            "name": "Verification Agent / عميل التحقق",
+            "role": "Validates doctor licenses / يتحقق من تراخيص الأطباء",
+        },
+        {
+            "name": "Authentication Agent / عميل الهوية",
+            "role": "Secure JWT management / إدارة الهوية الآمنة",
+        },
+        {
+            "name": "Persistence Agent / عميل الاستمرارية",
+            "role": "Manages medical memory graph / يدير سجل الذاكرة الطبية",
+        },
+        {
+            "name": "Governance Agent / عميل الحوكمة",
+            "role": "AES-256 encryption authority / سلطة التشفير والحوكمة",
+        },
+        {
+            "name": "Evolution Agent / عميل التطور",
+            "role": "Autonomous medical model fine-tuning / التطوير الذاتي للنماذج الطبية",
+        },
+    ],
+    "capabilities": [
+        {
+            "id": "AUTONOMOUS_LEARNING",
+            "label": "Autonomous Model Evolution / التطور الذاتي للنماذج",
+            "generative": True,
+        },
+        {
+            "id": "EHR_INTEROPERABILITY",
+            "label": "EHR/FHIR Integration / التكامل مع السجلات الإلكترونية",
+            "generative": False,
+        },
+        {
+            "id": "IMAGE_ANALYSIS",
+            "label": "Medical Image Analysis / تحليل الصور الطبية",
+            "generative": True,
+        },
+        {
+            "id": "GENERATE_REPORT",
+            "label": "Generate Report / إنشاء تقرير",
+            "generative": True,
+        },
+        {
+            "id": "GENERATE_RECOMMENDATION",
+            "label": "Generate Recommendation / إنشاء توصية",
+            "generative": True,
+        },
+        {
+            "id": "BOOK_APPOINTMENT",
+            "label": "Book Appointment / حجز موعد",
+            "generative": False,
+        },
+        {
+            "id": "RETRIEVE_HISTORY",
+            "label": "Retrieval History / استرجاع السجل",
+            "generative": False,
+        },
+        {
+            "id": "DATA_EXPORT",
+            "label": "Data Export / تصدير البيانات",
+            "generative": False,
+        },
+        {
+            "id": "MEMORY_GRAPH",
+            "label": "Memory Graph / سجل الذاكرة",
+            "generative": False,
+        },
+        {
+            "id": "RAG_INSIGHTS",
+            "label": "RAG Context / سياق المعرفة Retrieval Augmented Generation",
+            "generative": False,
+        },
+        {
+            "id": "TREE_OF_THOUGHT",
+            "label": "Clinical Reasoning (ToT) / التفكير السريري",
+            "generative": True,
+        },
+    ],
+}
+
+
+CAPABILITIES_JSON = orjson.dumps(CAPABILITIES)
+
+
 @app.get("/system/capabilities")
 async def get_capabilities():
     """List all active agents and generative capabilities (Bilingual)."""
-    return {
-        "agents": [
-            {
-                "name": "Triage Agent / عميل الفرز",
-                "role": "Analyzes symptoms and severity / يحلل الأعراض والخطورة",
-            },
-            {
-                "name": "Knowledge Agent / عميل المعرفة",
-                "role": "Retrieves medical literature via RAG / يسترجع الأدبيات الطبية",
-            },
-            {
-                "name": "Reasoning Agent / عميل التفكير",
-                "role": "Performs differential analysis / يقوم بالتحليل التفريقي",
-            },
-            {
-                "name": "Safety Agent / عميل السلامة",
-                "role": "Check for errors and safety / يتحقق من الأخطاء والسلامة",
-            },
-            {
-                "name": "Validation Agent / عميل التحقق",
-                "role": "Verifies medical accuracy / يتحقق من الدقة الطبية",
-            },
-            {
-                "name": "Vision Analysis Agent / عميل تحليل الصور",
-                "role": "Analyzes medical images (X-ray, Rashes, etc.) / يحلل الصور الطبية (الأشعة، الأمراض الجلدية، إلخ)",
-            },
-            {
-                "name": "Patient Agent / عميل المريض",
-                "role": "Manages patient profile and history / يدير ملف المريض وتاريخه",
-            },
-            {
-                "name": "Report Agent / عميل التقارير",
-                "role": "Generates medical reports / ينشئ التقارير الطبية",
-            },
-            {
-                "name": "Calendar Agent / عميل التقويم",
-                "role": "Manages appointments / يدير المواعيد",
-            },
-            {
-                "name": "Supervisor Agent / عميل الإشراف",
-                "role": "Monitors system health / يراقب صحة النظام",
-            },
-            {
-                "name": "Self-Improvement Agent / عميل التحسين الذاتي",
-                "role": "Learns from feedback / يتعلم من التعليقات",
-            },
-            {
-                "name": "Developer Control Agent / عميل التحكم المطور",
-                "role": "System management for devs / إدارة النظام للمطورين",
-            },
-            {
-                "name": "Medication Agent / عميل الأدوية",
-                "role": "Tracks dosages and reminders / يتتبع الجرعات والتذكيرات",
-            },
-            {
-                "name": "Second Opinion Agent / عميل الرأي الثاني",
-                "role": "Independent diagnostic audit / تدقيق تشخيصي مستقل",
-            },
-            {
-                "name": "Human Review Agent / عميل المراجعة البشرية",
-                "role": "Clinician-in-the-loop audit / مراجعة الطبيب المختص",
-            },
-            {
-                "name": "Verification Agent / عميل التحقق",
-                "role": "Validates doctor licenses / يتحقق من تراخيص الأطباء",
-            },
-            {
-                "name": "Authentication Agent / عميل الهوية",
-                "role": "Secure JWT management / إدارة الهوية الآمنة",
-            },
-            {
-                "name": "Persistence Agent / عميل الاستمرارية",
-                "role": "Manages medical memory graph / يدير سجل الذاكرة الطبية",
-            },
-            {
-                "name": "Governance Agent / عميل الحوكمة",
-                "role": "AES-256 encryption authority / سلطة التشفير والحوكمة",
-            },
-            {
-                "name": "Evolution Agent / عميل التطور",
-                "role": "Autonomous medical model fine-tuning / التطوير الذاتي للنماذج الطبية",
-            },
-        ],
-        "capabilities": [
-            {
-                "id": "AUTONOMOUS_LEARNING",
-                "label": "Autonomous Model Evolution / التطور الذاتي للنماذج",
-                "generative": True,
-            },
-            {
-                "id": "EHR_INTEROPERABILITY",
-                "label": "EHR/FHIR Integration / التكامل مع السجلات الإلكترونية",
-                "generative": False,
-            },
-            {
-                "id": "IMAGE_ANALYSIS",
-                "label": "Medical Image Analysis / تحليل الصور الطبية",
-                "generative": True,
-            },
-            {
-                "id": "GENERATE_REPORT",
-                "label": "Generate Report / إنشاء تقرير",
-                "generative": True,
-            },
-            {
-                "id": "GENERATE_RECOMMENDATION",
-                "label": "Generate Recommendation / إنشاء توصية",
-                "generative": True,
-            },
-            {
-                "id": "BOOK_APPOINTMENT",
-                "label": "Book Appointment / حجز موعد",
-                "generative": False,
-            },
-            {
-                "id": "RETRIEVE_HISTORY",
-                "label": "Retrieval History / استرجاع السجل",
-                "generative": False,
-            },
-            {
-                "id": "DATA_EXPORT",
-                "label": "Data Export / تصدير البيانات",
-                "generative": False,
-            },
-            {
-                "id": "MEMORY_GRAPH",
-                "label": "Memory Graph / سجل الذاكرة",
-                "generative": False,
-            },
-            {
-                "id": "RAG_INSIGHTS",
-                "label": "RAG Context / سياق المعرفة Retrieval Augmented Generation",
-                "generative": False,
-            },
-            {
-                "id": "TREE_OF_THOUGHT",
-                "label": "Clinical Reasoning (ToT) / التفكير السريري",
-                "generative": True,
-            },
-        ],
-    }
+    return Response(CAPABILITIES_JSON, media_type="application/json")
+
+
+# Resolved once at import; a missing prompt fails startup instead of a request
+LAB_INTERPRET_PROMPT = PROMPT_REGISTRY["MED-LOG-LAB-INT-001"]
+SOAP_PROMPT = PROMPT_REGISTRY["MED-OP-SOAP-001"]
+
+# Identical lab panels get the same deterministic (temperature 0) interpretation
+LAB_INTERPRET_CACHE_TTL = 3600  # seconds
 
 
 class LabsInterpretRequest(BaseModel):
@@ -384,25 +548,26 @@ class LabsInterpretRequest(BaseModel):
 async def labs_interpret(
     req: LabsInterpretRequest, user: dict = Depends(get_current_user)
 ):
-    from langchain_core.messages import HumanMessage, SystemMessage
-    from langchain_openai import ChatOpenAI
-
-    from agents.prompts.registry import PROMPT_REGISTRY
-
-    entry = PROMPT_REGISTRY.get("MED-LOG-LAB-INT-001")
-    if not entry:
-        raise HTTPException(status_code=500, detail="Lab interpretation prompt missing")
-    llm = ChatOpenAI(
-        model=settings.OPENAI_MODEL, temperature=0.0, api_key=settings.OPENAI_API_KEY
-    )
-    prompt = entry.content.format(lab_data=req.lab_data, standard_ranges="standard")
-    resp = llm.invoke(
-        [
-            SystemMessage(content="You are a Clinical Pathology Interpreter."),
-            HumanMessage(content=prompt),
-        ]
+    async def compute():
+        prompt = LAB_INTERPRET_PROMPT.content.format(
+            lab_data=req.lab_data, standard_ranges="standard"
+        )
+        resp = await get_chat_llm().ainvoke(
+            [
+                SystemMessage(content="You are a Clinical Pathology Interpreter."),
+                HumanMessage(content=prompt),
+            ]
+        )
+        return {"interpretation": resp.content}
+
+    # Keyed on the panel contents only, so the cache is shared across users
+    digest = hashlib.blake2b(
+        orjson.dumps(req.lab_data, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+    body = await response_cache.cached_json(
+        f"labs:{digest}", LAB_INTERPRET_CACHE_TTL, compute
     )
-    return {"interpretation": resp.content}
+    return Response(body, media_type="application/json")
 
 
 class SOAPRequest(BaseModel):
@@ -410,35 +575,30 @@ class SOAPRequest(BaseModel):
 
 
 @app.post("/docs/soap")
-async def docs_soap(req: SOAPRequest, user: dict = Depends(get_current_user)):
-    from langchain_core.messages import HumanMessage, SystemMessage
-    from langchain_openai import ChatOpenAI
-
-    from agents.prompts.registry import PROMPT_REGISTRY
-    from database.models import Interaction
-
-    pers = get_persistence()
-    inter = (
-        pers.db.query(Interaction).filter(Interaction.id == req.interaction_id).first()
+async def docs_soap(
+    req: SOAPRequest,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    inter = await db.scalar(
+        select(Interaction)
+        .options(*orm_load_options())
+        .where(Interaction.id == req.interaction_id)
     )
     if not inter:
         raise HTTPException(status_code=404, detail="Interaction not found")
     gov = get_governance()
-    patient_story = gov.decrypt(inter.user_input_encrypted)
-    diagnosis = gov.decrypt(inter.diagnosis_output_encrypted)
-    entry = PROMPT_REGISTRY.get("MED-OP-SOAP-001")
-    if not entry:
-        raise HTTPException(status_code=500, detail="SOAP prompt missing")
-    llm = ChatOpenAI(
-        model=settings.OPENAI_MODEL, temperature=0.0, api_key=settings.OPENAI_API_KEY
+    patient_story, diagnosis = await run_in_threadpool(
+        gov.decrypt_batch,
+        [inter.user_input_encrypted, inter.diagnosis_output_encrypted],
     )
-    prompt = entry.content.format(
+    prompt = SOAP_PROMPT.content.format(
         patient_story=patient_story,
         vitals_and_labs="N/A",
         diagnosis=diagnosis,
         next_steps="N/A",
     )
-    resp = llm.invoke(
+    resp = await get_chat_llm().ainvoke(
         [
             SystemMessage(content="Format strictly as SOAP note."),
             HumanMessage(content=prompt),
@@ -460,7 +620,7 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
         while True:
             data = await websocket.receive_text()
             try:
-                msg_data = json.loads(data)
+                msg_data = orjson.loads(data)
                 user_input = msg_data.get("text", "")
                 mode = msg_data.get("mode", "patient")
                 image_path = msg_data.get("image_path")
@@ -511,8 +671,6 @@ async def websocket_analytics(websocket: WebSocket):
 @app.post("/system/tts")
 async def text_to_speech(req: TTSRequest, user: dict = Depends(get_current_user)):
     """Generate audio for medical response using OpenAI Speech API."""
-    import openai
-
     client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
     try:
         response = client.audio.speech.create(
@@ -521,9 +679,22 @@ async def text_to_speech(req: TTSRequest, user: dict = Depends(get_current_user)
             input=req.text[:4000],  # OpenAI TTS limit
         )
         # Return binary audio stream
-        from fastapi.responses import Response
-
         return Response(content=response.content, media_type="audio/mpeg")
     except Exception as e:
         logger.error(f"TTS failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop has no Windows build; uvicorn falls back to the asyncio loop there
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=max(2, (os.cpu_count() or 2) // 2),
+        log_level=settings.LOG_LEVEL.lower(),
+    )
@@ -1,12 +1,17 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import (check_admin_auth, get_current_user, get_export_agent,
                       get_governance, get_persistence)
-from database.models import AIAuditLog, Interaction, UserSession
+from database.models import (AIAuditLog, Interaction, PatientProfile,
+                             UserSession, get_async_db)
+from learning.feedback_loop import FeedbackRLLoop
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -58,49 +63,48 @@ async def get_medications(user: dict = Depends(get_current_user)):
 
 
 @router.get("/export-pdf")
-async def export_analytics_report(user: dict = Depends(get_current_user)):
-    pers = get_persistence()
+async def export_analytics_report(
+    user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+):
     exporter = get_export_agent()
     gov = get_governance()
 
-    # Fetch patient profile
-    # Using PersistenceAgent internal db access for complex query
-    db = pers.db
     try:
-        from database.models import Interaction, PatientProfile, UserSession
-
-        p = db.query(PatientProfile).filter(PatientProfile.id == user["sub"]).first()
+        p = await db.get(PatientProfile, user["sub"])
         if not p:
             raise HTTPException(status_code=404, detail="Profile not found")
 
         profile_dict = {"id": p.id, "age": p.age, "gender": p.gender}
 
         # Fetch last 20 interactions
-        items = (
-            db.query(Interaction)
-            .filter(
+        result = await db.scalars(
+            select(Interaction)
+            .where(
                 Interaction.session_id.in_(
-                    db.query(UserSession.id).filter(UserSession.user_id == user["sub"])
+                    select(UserSession.id).where(UserSession.user_id == user["sub"])
                 )
             )
             .order_by(Interaction.timestamp.desc())
             .limit(20)
-            .all()
         )
+        items = result.all()
 
-        interactions = []
-        for i in items:
-            interactions.append(
-                {
-                    "timestamp": i.timestamp.isoformat(),
-                    "diagnosis": gov.decrypt(i.diagnosis_output_encrypted),
-                    "audit_hash": i.audit_hash,
-                }
-            )
+        # Decrypt every diagnosis in one worker-thread hop
+        diagnoses = await run_in_threadpool(
+            gov.decrypt_batch, [i.diagnosis_output_encrypted for i in items]
+        )
+        interactions = [
+            {
+                "timestamp": i.timestamp.isoformat(),
+                "diagnosis": diagnosis,
+                "audit_hash": i.audit_hash,
+            }
+            for i, diagnosis in zip(items, diagnoses)
+        ]
 
         file_path = f"export_{user['sub']}.pdf"
-        success = exporter.generate_patient_summary_pdf(
-            profile_dict, interactions, file_path
+        success = await run_in_threadpool(
+            exporter.generate_patient_summary_pdf, profile_dict, interactions, file_path
         )
 
         if success:
@@ -114,35 +118,38 @@ async def export_analytics_report(user: dict = Depends(get_current_user)):
 
 
 @router.get("/overview")
-async def get_analytics_overview(admin: dict = Depends(check_admin_auth)):
+async def get_analytics_overview(
+    admin: dict = Depends(check_admin_auth), db: AsyncSession = Depends(get_async_db)
+):
     """Retrieve global system health and clinical performance metrics (Admin only)."""
-    pers = get_persistence()
-    db = pers.db
     try:
-        from sqlalchemy import func
-
-        from learning.feedback_loop import FeedbackRLLoop
-
         rl_loop = FeedbackRLLoop()
         learning_stats = rl_loop.analyze_clinical_trends()
 
-        total_sessions = db.query(UserSession).count()
-        total_interactions = db.query(Interaction).count()
-
-        # Risk distribution
-        high_risk_count = (
-            db.query(Interaction).filter(Interaction.risk_level == "High").count()
-        )
-        emergency_count = (
-            db.query(Interaction).filter(Interaction.risk_level == "Emergency").count()
-        )
+        total_sessions = await db.scalar(select(func.count(UserSession.id)))
+
+        # Totals, risk distribution and average latency in one pass over interactions
+        row = (
+            await db.execute(
+                select(
+                    func.count(Interaction.id),
+                    func.count(Interaction.id).filter(
+                        Interaction.risk_level == "High"
+                    ),
+                    func.count(Interaction.id).filter(
+                        Interaction.risk_level == "Emergency"
+                    ),
+                    func.avg(Interaction.latency_ms),
+                )
+            )
+        ).one()
+        total_interactions, high_risk_count, emergency_count, avg_latency_raw = row
 
         # Safety Blocks
 
         safety_alerts = learning_stats.get("safety_alerts", 0)
 
         # Latency (Avg)
-        avg_latency_raw = db.query(func.avg(Interaction.latency_ms)).scalar()
         avg_latency = float(avg_latency_raw) if avg_latency_raw is not None else 0.0
 
         # Agent Performance (Mocked for now)
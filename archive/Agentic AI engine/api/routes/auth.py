@@ -2,14 +2,15 @@
 Authentication & User Management Routes.
 """
 
+import csv
+import io
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from pydantic import BaseModel, EmailStr
 
-from agents.authentication_agent import AuthenticationAgent
-from agents.persistence_agent import PersistenceAgent
-from api.deps import get_current_user
+from api.deps import get_auth_agent, get_current_user, get_persistence
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -40,20 +41,10 @@ class LoginRequest(BaseModel):
     password: str
 
 
-def get_auth_agent():
-    return AuthenticationAgent()
-
-
-def get_persistence():
-    return PersistenceAgent()
-
-
 @router.post("/register")
 async def register(req: RegisterRequest):
     pers = get_persistence()
-    if await pers.get_user_by_login(req.username) or await pers.get_user_by_login(
-        req.email
-    ):
+    if await pers.user_exists_any(req.username, req.email, req.phone):
         raise HTTPException(status_code=400, detail="User already exists")
 
     user_id = await pers.register_user(
@@ -117,33 +108,22 @@ async def export_user_data(user: dict = Depends(get_current_user)):
     reports = await pers.get_reports_by_patient(user_id)
     meds = await pers.get_medications(user_id)
 
-    import io
-
-    import pandas as pd
-
-    data = []
-    for r in reports:
-        data.append(
-            {
-                "type": "Medical Report",
-                "date": str(r.get("generated_at")),
-                "content": str(r.get("content")),
-            }
-        )
-    for m in meds:
-        data.append(
-            {
-                "type": "Medication",
-                "date": "Active",
-                "content": f"{m.get('name')} {m.get('dosage')} {m.get('frequency')}",
-            }
-        )
-
-    df = pd.DataFrame(data)
     stream = io.StringIO()
-    df.to_csv(stream, index=False)
-
-    from fastapi.responses import Response
+    writer = csv.writer(stream)
+    writer.writerow(["type", "date", "content"])
+    # writerows drives the row loop in C; generators avoid a list of rows
+    writer.writerows(
+        ["Medical Report", str(r.get("generated_at")), str(r.get("content"))]
+        for r in reports
+    )
+    writer.writerows(
+        [
+            "Medication",
+            "Active",
+            f"{m.get('name')} {m.get('dosage')} {m.get('frequency')}",
+        ]
+        for m in meds
+    )
 
     return Response(
         content=stream.getvalue(),
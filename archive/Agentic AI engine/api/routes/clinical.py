@@ -2,19 +2,30 @@
 Clinical Consultation & Image Analysis Routes.
 """
 
+import asyncio
+import logging
 import time
-import uuid
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from fastapi import (APIRouter, BackgroundTasks, Depends, File, HTTPException,
-                     UploadFile)
-from pydantic import BaseModel, field_validator
-
-from api.deps import (get_current_user, get_generative_engine,
-                      get_orchestrator, get_persistence)
+                     Query, Response, UploadFile)
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.deps import (NEXT_CURSOR_HEADER, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX,
+                      get_current_user, get_generative_engine,
+                      get_orchestrator, get_persistence, keyset_page,
+                      orm_load_options)
+from database.models import MedicalImage, get_async_db
+from utils.list_cache import get_cached_list, set_cached_list
+from utils.rate_limit import check_rate_limit
 
 router = APIRouter(prefix="/clinical", tags=["Clinical"])
 
+MAX_CONSULT_BATCH = 16
+
 
 class PatientRequest(BaseModel):
     symptoms: str
@@ -31,6 +42,10 @@ class PatientRequest(BaseModel):
         return v
 
 
+class BatchConsultRequest(BaseModel):
+    items: List[PatientRequest] = Field(..., min_length=1, max_length=MAX_CONSULT_BATCH)
+
+
 class EduRequest(BaseModel):
     topic: str
     audience: str = "patient"
@@ -65,6 +80,49 @@ async def consult(request: PatientRequest):
     return result
 
 
+async def _consult_one(orch, item: PatientRequest) -> dict:
+    t0 = time.perf_counter()
+    try:
+        result = await orch.run(
+            item.symptoms,
+            user_id=item.patient_id,
+            image_path=item.image_path,
+            request_second_opinion=item.request_second_opinion,
+            interaction_mode=item.interaction_mode,
+        )
+    except Exception as e:
+        logging.error(f"Batch consult item failed: {e}")
+        result = {"status": "error", "final_response": "Consultation failed"}
+    result["latency_ms"] = int((time.perf_counter() - t0) * 1000)
+    return result
+
+
+@router.post("/consult/batch")
+async def consult_batch(
+    request: BatchConsultRequest, user: dict = Depends(get_current_user)
+):
+    """Run several consultations concurrently in one request.
+
+    Results keep the input order; a failed item carries status "error"
+    instead of failing the whole batch. Each item counts against the caller's
+    rate limit as one consultation.
+    """
+    allowed, retry_after = check_rate_limit(
+        f"user:{user['sub']}", cost=len(request.items)
+    )
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(retry_after)},
+        )
+    orch = get_orchestrator()
+    results = await asyncio.gather(
+        *(_consult_one(orch, item) for item in request.items)
+    )
+    return {"results": results}
+
+
 @router.post("/generative/education")
 async def generate_education(req: EduRequest, user: dict = Depends(get_current_user)):
     gen = get_generative_engine()
@@ -91,94 +149,106 @@ async def generate_simulation(condition: str, user: dict = Depends(get_current_u
     return {"simulation": content}
 
 
+def _serialize_image(img, findings) -> dict:
+    """Build the API view of a MedicalImage row from its decrypted findings."""
+    return {
+        "id": img.id,
+        "filename": img.original_filename,
+        "timestamp": str(img.timestamp),
+        "confidence": img.confidence_score,
+        "severity": img.severity_level,
+        "requires_review": img.requires_human_review,
+        "conditions": img.possible_conditions_json or [],
+        "findings": findings if findings is not None else {"status": "encrypted"},
+    }
+
+
+def _serialize_images(rows, gov) -> list:
+    findings = gov.decrypt_json_batch([r.visual_findings_encrypted for r in rows])
+    return [_serialize_image(r, f) for r, f in zip(rows, findings)]
+
+
 @router.get("/images")
-async def get_user_images(user: dict = Depends(get_current_user)):
-    """List all uploaded medical images with analysis results for the current user."""
+async def get_user_images(
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, ge=1),
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List uploaded medical images with analysis results, newest first.
+
+    The body stays a plain list; when more rows exist the id to pass as ``cursor``
+    for the next page is returned in the X-Next-Cursor header.
+    """
+    # Only the default first page is cached; it is what dashboards poll
+    first_page = cursor is None and limit == PAGE_SIZE_DEFAULT
+    if first_page:
+        cached = get_cached_list("images", user["sub"])
+        if cached is not None:
+            results, next_cursor = cached
+            if next_cursor is not None:
+                response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+            return results
+
     pers = get_persistence()
+    gov = pers.governance
     try:
-        from database.models import MedicalImage
-
-        images = (
-            pers.db.query(MedicalImage)
-            .filter(MedicalImage.patient_id == user["sub"])
-            .order_by(MedicalImage.timestamp.desc())
-            .all()
-        )
-
-        results = []
-        import json
-
-        for img in images:
-            findings = {}
-            if img.visual_findings_encrypted:
-                try:
-                    findings = json.loads(
-                        pers.governance.decrypt(img.visual_findings_encrypted)
-                    )
-                except Exception:
-                    findings = {"status": "encrypted"}
-
-            results.append(
-                {
-                    "id": img.id,
-                    "filename": img.original_filename,
-                    "timestamp": str(img.timestamp),
-                    "confidence": img.confidence_score,
-                    "severity": img.severity_level,
-                    "requires_review": img.requires_human_review,
-                    "conditions": img.possible_conditions_json or [],
-                    "findings": findings,
-                }
+        # Project only the response columns; skips ORM identity-map hydration
+        query = (
+            select(
+                MedicalImage.id,
+                MedicalImage.original_filename,
+                MedicalImage.timestamp,
+                MedicalImage.confidence_score,
+                MedicalImage.severity_level,
+                MedicalImage.requires_human_review,
+                MedicalImage.possible_conditions_json,
+                MedicalImage.visual_findings_encrypted,
             )
+            .where(MedicalImage.patient_id == user["sub"])
+            .order_by(MedicalImage.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            query = query.where(MedicalImage.id < cursor)
+        images, next_cursor = keyset_page((await db.execute(query)).all(), limit)
+
+        # Decrypt every row's findings in a single worker-thread hop
+        results = await run_in_threadpool(_serialize_images, images, gov)
+        if first_page:
+            set_cached_list("images", user["sub"], (results, next_cursor))
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
         return results
     except Exception as e:
-        import logging
-
         logging.error(f"Failed to fetch images: {e}")
         return []
 
 
 @router.get("/images/{image_id}")
-async def get_image_detail(image_id: int, user: dict = Depends(get_current_user)):
+async def get_image_detail(
+    image_id: int,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     """Get detailed analysis for a specific medical image."""
     pers = get_persistence()
     try:
-        from database.models import MedicalImage
-
-        img = (
-            pers.db.query(MedicalImage)
-            .filter(MedicalImage.id == image_id, MedicalImage.patient_id == user["sub"])
-            .first()
+        img = await db.scalar(
+            select(MedicalImage)
+            .options(*orm_load_options())
+            .where(MedicalImage.id == image_id, MedicalImage.patient_id == user["sub"])
         )
 
         if not img:
             raise HTTPException(status_code=404, detail="Image not found")
 
-        import json
-
-        findings = {}
-        if img.visual_findings_encrypted:
-            try:
-                findings = json.loads(
-                    pers.governance.decrypt(img.visual_findings_encrypted)
-                )
-            except Exception:
-                findings = {"status": "encrypted"}
-
-        return {
-            "id": img.id,
-            "filename": img.original_filename,
-            "timestamp": str(img.timestamp),
-            "confidence": img.confidence_score,
-            "severity": img.severity_level,
-            "requires_review": img.requires_human_review,
-            "conditions": img.possible_conditions_json or [],
-            "findings": findings,
-        }
+        return _serialize_image(
+            img, pers.governance.decrypt_json(img.visual_findings_encrypted)
+        )
     except HTTPException:
         raise
     except Exception as e:
-        import logging
-
         logging.error(f"Failed to fetch image detail: {e}")
         raise HTTPException(status_code=500, detail=str(e))
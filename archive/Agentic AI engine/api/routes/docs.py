@@ -1,21 +1,18 @@
+import os
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from pydantic import BaseModel
 
 from agents.docs_agent import DocsAgent
+from api.deps import lazy_singleton
+from config import settings
 
 router = APIRouter(prefix="/docs", tags=["AI Documentation"])
 
-# Singleton instantiation
-_docs_agent = None
-
 
 def get_docs_agent():
-    global _docs_agent
-    if _docs_agent is None:
-        _docs_agent = DocsAgent()
-    return _docs_agent
+    return lazy_singleton(DocsAgent)
 
 
 class ChatRequest(BaseModel):
@@ -70,13 +67,10 @@ async def docs_debug(req: DebugRequest):
     return res
 
 
+# Plain def: FastAPI runs it in the threadpool, keeping the os.walk off the event loop
 @router.get("/files")
-async def list_indexed_files():
+def list_indexed_files():
     """Returns a list of all indexable files for the UI File Explorer."""
-    import os
-
-    from config import settings
-
     root_dir = settings.BASE_DIR
     target_dirs = ["agents", "api", "database", "prompts", "utils", "tests"]
     file_list = []
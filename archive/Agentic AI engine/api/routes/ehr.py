@@ -1,12 +1,13 @@
-import json
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.deps import (get_current_user, get_governance, get_interop_builder,
-                      get_persistence)
+from api.deps import get_current_user, get_interop_builder, get_persistence
+from database.models import MedicalReport, get_async_db
 from integrations.ehr_integration import ehr_manager
 
 router = APIRouter(prefix="/ehr", tags=["EHR Integration"])
@@ -50,23 +51,23 @@ async def push_ai_report(
 
 
 @router.post("/interop/fhir")
-async def export_fhir(req: InteropRequest, user: dict = Depends(get_current_user)):
+async def export_fhir(
+    req: InteropRequest,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     pers = get_persistence()
-    gov = get_governance()
-    from database.models import MedicalReport
 
     # Fetch report and related interaction/session
-    report = (
-        pers.db.query(MedicalReport)
-        .filter(
+    report = await db.scalar(
+        select(MedicalReport).where(
             MedicalReport.id == req.report_id, MedicalReport.patient_id == user["sub"]
         )
-        .first()
     )
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     # Build clinical data from decrypted report content and minimal metadata
-    content = json.loads(gov.decrypt(report.report_content_encrypted))
+    content = pers.decrypt_report(report)
     clinical_data = {
         "patient_id": report.patient_id,
         "generated_at": str(report.generated_at),
@@ -77,25 +78,25 @@ async def export_fhir(req: InteropRequest, user: dict = Depends(get_current_user
     fhir = builder.build_fhir_bundle(clinical_data)
     if isinstance(fhir, dict) and fhir.get("error"):
         raise HTTPException(status_code=500, detail=fhir["error"])
-    return JSONResponse(content=fhir)
+    return ORJSONResponse(content=fhir)
 
 
 @router.post("/interop/hl7")
-async def export_hl7(req: InteropRequest, user: dict = Depends(get_current_user)):
+async def export_hl7(
+    req: InteropRequest,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     pers = get_persistence()
-    gov = get_governance()
-    from database.models import MedicalReport
 
-    report = (
-        pers.db.query(MedicalReport)
-        .filter(
+    report = await db.scalar(
+        select(MedicalReport).where(
             MedicalReport.id == req.report_id, MedicalReport.patient_id == user["sub"]
         )
-        .first()
     )
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
-    content = json.loads(gov.decrypt(report.report_content_encrypted))
+    content = pers.decrypt_report(report)
     interaction_data = {
         "patient_id": report.patient_id,
         "generated_at": str(report.generated_at),
@@ -106,4 +107,4 @@ async def export_hl7(req: InteropRequest, user: dict = Depends(get_current_user)
     hl7 = builder.build_hl7_v2(interaction_data)
     if isinstance(hl7, str) and hl7.startswith("ERROR:"):
         raise HTTPException(status_code=500, detail=hl7)
-    return JSONResponse(content={"hl7": hl7})
+    return ORJSONResponse(content={"hl7": hl7})
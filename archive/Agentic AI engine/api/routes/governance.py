@@ -3,40 +3,45 @@ Clinical Governance & HITL Review Routes.
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user, oauth2_scheme
-from database.models import AIAuditLog, Interaction, ReviewStatus, SessionLocal
+from database.models import (AIAuditLog, Interaction, ReviewStatus,
+                             get_async_db)
+from utils.audit_logger import AuditLogger
 
 router = APIRouter(prefix="/governance", tags=["Governance"])
 
 
 @router.get("/audit-logs")
-async def get_audit_logs(limit: int = 50, token: str = Depends(oauth2_scheme)):
+async def get_audit_logs(
+    limit: int = 50,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
     """Retrieve high-fidelity AI audit logs for clinical compliance."""
-    with SessionLocal() as db:
-        return (
-            db.query(AIAuditLog)
-            .order_by(AIAuditLog.timestamp.desc())
-            .limit(limit)
-            .all()
-        )
+    result = await db.scalars(
+        select(AIAuditLog).order_by(AIAuditLog.timestamp.desc()).limit(limit)
+    )
+    return result.all()
 
 
 @router.post("/review/approve")
 async def approve_case(
-    interaction_id: int, comment: str, token: str = Depends(oauth2_scheme)
+    interaction_id: int,
+    comment: str,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Doctor approval for a high-risk AI suggestion."""
-    with SessionLocal() as db:
-        interaction = (
-            db.query(Interaction).filter(Interaction.id == interaction_id).first()
-        )
-        if interaction:
-            interaction.review_status = ReviewStatus.APPROVED
-            interaction.reviewer_comment = comment
-            db.commit()
-            return {"status": "Case approved"}
-        raise HTTPException(status_code=404, detail="Interaction not found")
+    interaction = await db.get(Interaction, interaction_id)
+    if interaction:
+        interaction.review_status = ReviewStatus.APPROVED
+        interaction.reviewer_comment = comment
+        await db.commit()
+        return {"status": "Case approved"}
+    raise HTTPException(status_code=404, detail="Interaction not found")
 
 
 @router.get("/compliance/export")
@@ -44,8 +49,6 @@ async def export_compliance_report(
     format: str = "fhir", token: str = Depends(oauth2_scheme)
 ):
     """Export clinical logs in regulated formats (FHIR AuditEvent)."""
-    from utils.audit_logger import AuditLogger
-
     if format == "fhir":
         return AuditLogger.export_fhir_audit_event(
             log_id=0
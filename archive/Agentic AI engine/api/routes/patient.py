@@ -2,11 +2,15 @@
 Clinical Data Hub - Reports, Medications, and Calendar.
 """
 
-import json
+import hashlib
 import os
+import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from agents.calendar_agent import CalendarAgent
 from agents.medication_agent import MedicationAgent
@@ -14,78 +18,106 @@ from agents.persistence_agent import PersistenceAgent
 from agents.report_agent import ReportAgent
 from api.deps import get_current_user, get_persistence, get_report_agent
 from config import settings
+from database.models import MedicalReport, get_async_db
+from utils.list_cache import get_cached_list, set_cached_list
 
 router = APIRouter(prefix="/data", tags=["Patient Data"])
 
 
 @router.get("/reports")
 async def get_reports(user: dict = Depends(get_current_user)):
+    cached = get_cached_list("reports", user["sub"])
+    if cached is not None:
+        return cached
+
     agent = get_report_agent()
-    return agent.get_user_reports(user["sub"])
+    reports = await agent.get_user_reports(user["sub"])
+    set_cached_list("reports", user["sub"], reports)
+    return reports
+
+
+# format -> (file extension, media type, ReportAgent renderer)
+EXPORT_FORMATS = {
+    "pdf": ("pdf", "application/pdf", "generate_pdf"),
+    "image": ("png", "image/png", "generate_image"),
+    "png": ("png", "image/png", "generate_image"),
+    "text": ("txt", "text/plain", "generate_text"),
+    "txt": ("txt", "text/plain", "generate_text"),
+}
+EXPORT_CACHE_HEADERS = {"Cache-Control": "private, max-age=3600"}
+
+
+def _render_export(render, data: dict, path: str) -> bool:
+    """Render to a temp file and rename it into place (runs in a worker thread).
+
+    A crash mid-render never leaves a partial file that later requests would
+    serve as a cache hit.
+    """
+    tmp_path = os.path.join(
+        os.path.dirname(path), f"tmp_{uuid.uuid4().hex}{os.path.splitext(path)[1]}"
+    )
+    if not render(data, tmp_path):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
 
 
 @router.get("/reports/{report_id}/export")
 async def export_report(
-    report_id: int, format: str = "pdf", user: dict = Depends(get_current_user)
+    report_id: int,
+    format: str = "pdf",
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     pers = get_persistence()
     agent = get_report_agent()
 
-    # Get report data
-    from database.models import MedicalReport
-
-    # Note: Use synchronous query if persistence.db is sync, or async if it's async
-    # main.py was using pers.db.query, which suggests sync.
-    # But PersistenceAgent methods are async.
-    # Let's check how main.py did it. It was using pers.db.query.
-
-    report = (
-        pers.db.query(MedicalReport)
-        .filter(MedicalReport.id == report_id, MedicalReport.patient_id == user["sub"])
-        .first()
+    report = await db.scalar(
+        select(MedicalReport).where(
+            MedicalReport.id == report_id, MedicalReport.patient_id == user["sub"]
+        )
     )
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    data = json.loads(pers.governance.decrypt(report.report_content_encrypted))
-
-    # Add metadata for professional look
-    data["patient_id"] = report.patient_id
-    data["date"] = report.generated_at.strftime("%Y-%m-%d %H:%M")
-    data["lang"] = report.language
-
     format = format.lower()
-    if format == "pdf":
-        filename = f"report_{report_id}.pdf"
-        media_type = "application/pdf"
-        success = agent.generate_pdf(
-            data, os.path.join(settings.DATA_DIR, "uploads", filename)
-        )
-    elif format == "image" or format == "png":
-        filename = f"report_{report_id}.png"
-        media_type = "image/png"
-        success = agent.generate_image(
-            data, os.path.join(settings.DATA_DIR, "uploads", filename)
-        )
-    elif format == "text" or format == "txt":
-        filename = f"report_{report_id}.txt"
-        media_type = "text/plain"
-        success = agent.generate_text(
-            data, os.path.join(settings.DATA_DIR, "uploads", filename)
-        )
-    else:
+    if format not in EXPORT_FORMATS:
         raise HTTPException(
             status_code=400, detail="Unsupported format. Use pdf, image, or text."
         )
+    ext, media_type, renderer = EXPORT_FORMATS[format]
+
+    # Reports are immutable once generated, so a rendered file keyed by the
+    # stored ciphertext can be served again without decrypting or re-rendering.
+    content_hash = hashlib.sha256(
+        (report.report_content_encrypted or "").encode("utf-8")
+    ).hexdigest()[:16]
+    filename = f"report_{report_id}.{ext}"
+    path = os.path.join(
+        settings.DATA_DIR, "uploads", f"report_{report_id}_{content_hash}.{ext}"
+    )
 
-    path = os.path.join(settings.DATA_DIR, "uploads", filename)
+    if not os.path.exists(path):
+        data = pers.decrypt_report(report)
 
-    if not success:
-        raise HTTPException(
-            status_code=500, detail=f"{format.upper()} generation failed"
+        # Add metadata for professional look
+        data["patient_id"] = report.patient_id
+        data["date"] = report.generated_at.strftime("%Y-%m-%d %H:%M")
+        data["lang"] = report.language
+
+        success = await run_in_threadpool(
+            _render_export, getattr(agent, renderer), data, path
         )
+        if not success:
+            raise HTTPException(
+                status_code=500, detail=f"{format.upper()} generation failed"
+            )
 
-    return FileResponse(path, filename=filename, media_type=media_type)
+    return FileResponse(
+        path, filename=filename, media_type=media_type, headers=EXPORT_CACHE_HEADERS
+    )
 
 
 @router.get("/history")
@@ -14,6 +14,7 @@ class ExplainRequest(BaseModel):
 @router.post("/explain")
 async def pediatric_explain(req: ExplainRequest, token: str = Depends(oauth2_scheme)):
     """Translate clinical results into Theo's child-friendly explanation."""
+    # Lazy: pulls in the local-model router (Ollama/langchain_community stack)
     from agents.pediatric_agent import PediatricAgent
 
     agent = PediatricAgent()
@@ -2,24 +2,46 @@
 System Health, Metrics, and Admin Controls.
 """
 
-from typing import Optional
+import asyncio
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.messages import HumanMessage, SystemMessage
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-from pydantic import BaseModel
-
-from api.deps import (check_admin_auth, get_audit_agent, get_current_user,
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agents.intelligence.ab_tester import ABTester
+from agents.prompts.registry import PROMPT_REGISTRY
+from api.deps import (PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, check_admin_auth,
+                      get_audit_agent, get_chat_llm, get_current_user,
                       get_developer_agent, get_governance, get_improver,
-                      get_persistence, get_review_agent)
+                      get_persistence, get_review_agent, orm_load_options)
+from database.models import (AsyncSessionLocal, AuditLog, Interaction,
+                             ReviewStatus, get_async_db)
+from utils import response_cache
 
 router = APIRouter(prefix="/system", tags=["System"])
 
+# Resolved once at import; a missing prompt fails startup instead of a request
+REGISTRY_REVIEW_PROMPT = PROMPT_REGISTRY["MED-GOV-REGISTRY-001"]
+
+# Response cache TTLs (seconds); admins can send X-Cache-Bypass: 1 to force a refresh
+PENDING_REVIEWS_CACHE_TTL = 10
+IMPROVEMENT_REPORT_CACHE_TTL = 60
+
 
 class UserActionRequest(BaseModel):
+    # Posted on every UI interaction; unknown client fields are dropped, not validated
+    model_config = ConfigDict(extra="ignore")
+
     session_id: str
     action_type: str
     element_id: str
-    details: Optional[dict] = None
+    details: Optional[Dict[str, Any]] = None
 
 
 class AdminReviewAction(BaseModel):
@@ -115,24 +137,52 @@ async def trigger_tests():
 
 
 @router.get("/admin/pending-reviews", dependencies=[Depends(check_admin_auth)])
-async def get_pending_reviews():
-    """Get interactions flagged for human review."""
+async def get_pending_reviews(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, ge=1),
+    bypass: bool = Header(False, alias="X-Cache-Bypass"),
+):
+    """Get interactions flagged for human review, newest first.
+
+    Page with ``cursor`` set to the last id received; a short page is the last one.
+    """
+
+    async def compute():
+        return await _load_pending_reviews(limit, cursor)
+
+    if cursor is None and limit == PAGE_SIZE_DEFAULT:
+        # Only the default first page (what the dashboard polls) is cached
+        body = await response_cache.cached_json(
+            "pending-reviews", PENDING_REVIEWS_CACHE_TTL, compute, bypass
+        )
+    else:
+        body = orjson.dumps(await compute())
+    return Response(body, media_type="application/json")
+
+
+async def _load_pending_reviews(limit: int, cursor: Optional[int]):
     review_agent = get_review_agent()
     gov = get_governance()
-    items = review_agent.get_flagged_interactions()
+    items = await run_in_threadpool(
+        review_agent.get_flagged_interactions, limit, cursor
+    )
 
-    results = []
+    # Both encrypted columns for every row are decrypted in one worker-thread hop
+    tokens = []
     for i in items:
-        results.append(
-            {
-                "id": i.id,
-                "session_id": i.session_id,
-                "user_input": gov.decrypt(i.user_input_encrypted),
-                "diagnosis": gov.decrypt(i.diagnosis_output_encrypted),
-                "timestamp": i.timestamp,
-            }
-        )
-    return results
+        tokens += (i.user_input_encrypted, i.diagnosis_output_encrypted)
+    plain = await run_in_threadpool(gov.decrypt_batch, tokens)
+
+    return [
+        {
+            "id": i.id,
+            "session_id": i.session_id,
+            "user_input": user_input,
+            "diagnosis": diagnosis,
+            "timestamp": i.timestamp,
+        }
+        for i, user_input, diagnosis in zip(items, plain[0::2], plain[1::2])
+    ]
 
 
 @router.post("/admin/review-action", dependencies=[Depends(check_admin_auth)])
@@ -146,23 +196,28 @@ async def review_action(action: AdminReviewAction):
     )
     if not success:
         raise HTTPException(status_code=500, detail="Failed to process review action")
+    # The action clears requires_human_review, so the item leaves the queue
+    await response_cache.invalidate("pending-reviews")
     return {"status": "updated", "action": action.action}
 
 
 @router.get("/admin/improvement-report", dependencies=[Depends(check_admin_auth)])
-async def improvement_report():
+async def improvement_report(bypass: bool = Header(False, alias="X-Cache-Bypass")):
     """Get Self-Improvement analysis."""
-    improver = get_improver()
-    report = improver.generate_improvement_report()
-    return {"report": report}
+
+    async def compute():
+        return {"report": get_improver().generate_improvement_report()}
+
+    body = await response_cache.cached_json(
+        "improvement-report", IMPROVEMENT_REPORT_CACHE_TTL, compute, bypass
+    )
+    return Response(body, media_type="application/json")
 
 
 @router.post("/experiments/ab-test", dependencies=[Depends(check_admin_auth)])
 async def ab_test(req: ABTestRequest):
-    from agents.intelligence.ab_tester import ABTester
-
     tester = ABTester()
-    result = tester.run_comparison(
+    result = await tester.run_comparison_async(
         req.prompt_id, req.prompt_a, req.prompt_b, req.test_cases
     )
     return result
@@ -170,22 +225,10 @@ async def ab_test(req: ABTestRequest):
 
 @router.post("/registry/review", dependencies=[Depends(check_admin_auth)])
 async def registry_review(req: RegistryReviewRequest):
-    from langchain_core.messages import HumanMessage, SystemMessage
-    from langchain_openai import ChatOpenAI
-
-    from agents.prompts.registry import PROMPT_REGISTRY
-    from config import settings
-
-    entry = PROMPT_REGISTRY.get("MED-GOV-REGISTRY-001")
-    if not entry:
-        raise HTTPException(status_code=500, detail="Registry review prompt missing")
-    llm = ChatOpenAI(
-        model=settings.OPENAI_MODEL, temperature=0.0, api_key=settings.OPENAI_API_KEY
-    )
-    prompt = entry.content.format(
+    prompt = REGISTRY_REVIEW_PROMPT.content.format(
         old_hash=req.old_hash, new_hash=req.new_hash, delta_report=req.delta_report
     )
-    resp = llm.invoke(
+    resp = await get_chat_llm().ainvoke(
         [
             SystemMessage(content="You are the Prompt Registry Governance Engine."),
             HumanMessage(content=prompt),
@@ -195,12 +238,13 @@ async def registry_review(req: RegistryReviewRequest):
 
 
 @router.post("/admin/override-escalation", dependencies=[Depends(check_admin_auth)])
-async def override_escalation(req: OverrideEscalationRequest):
-    from database.models import Interaction, ReviewStatus
-
-    pers = get_persistence()
-    inter = (
-        pers.db.query(Interaction).filter(Interaction.id == req.interaction_id).first()
+async def override_escalation(
+    req: OverrideEscalationRequest, db: AsyncSession = Depends(get_async_db)
+):
+    inter = await db.scalar(
+        select(Interaction)
+        .options(*orm_load_options())
+        .where(Interaction.id == req.interaction_id)
     )
     if not inter:
         raise HTTPException(status_code=404, detail="Interaction not found")
@@ -209,23 +253,41 @@ async def override_escalation(req: OverrideEscalationRequest):
         ReviewStatus.APPROVED if req.override else ReviewStatus.FLAGGED
     )
     inter.reviewer_comment = req.rationale
-    pers.db.commit()
+    await db.commit()
+    await response_cache.invalidate("pending-reviews")
     return {"status": "ok", "requires_human_review": inter.requires_human_review}
 
 
+async def _fetch_interaction(interaction_id: Optional[int]):
+    if not interaction_id:
+        return None
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(
+            select(Interaction)
+            .options(*orm_load_options())
+            .where(Interaction.id == interaction_id)
+        )
+
+
+async def _fetch_recent_audit_logs(limit: int = 10):
+    async with AsyncSessionLocal() as db:
+        result = await db.scalars(
+            select(AuditLog)
+            .options(*orm_load_options())
+            .order_by(AuditLog.timestamp.desc())
+            .limit(limit)
+        )
+        return result.all()
+
+
 @router.post("/admin/audit-export", dependencies=[Depends(check_admin_auth)])
 async def audit_export(req: AuditExportRequest):
-    from database.models import AuditLog, Interaction
-
-    pers = get_persistence()
-    gov = get_governance()
+    # A session cannot run two statements at once, so each query gets its own
+    inter, logs = await asyncio.gather(
+        _fetch_interaction(req.interaction_id), _fetch_recent_audit_logs()
+    )
     data = {}
     if req.interaction_id:
-        inter = (
-            pers.db.query(Interaction)
-            .filter(Interaction.id == req.interaction_id)
-            .first()
-        )
         if not inter:
             raise HTTPException(status_code=404, detail="Interaction not found")
         data["interaction"] = {
@@ -238,7 +300,6 @@ async def audit_export(req: AuditExportRequest):
             "confidence_score": inter.confidence_score,
         }
     # include recent audit logs summary
-    logs = pers.db.query(AuditLog).order_by(AuditLog.timestamp.desc()).limit(10).all()
     data["audit_logs"] = [
         {
             "time": str(l.timestamp),
@@ -1,12 +1,19 @@
-import json
 import logging
 from typing import Dict, List, Set, Union
 
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
 
+def _encode(message: Union[str, Dict]) -> str:
+    """Serialize a WS payload once (orjson; non-str keys allowed like json.dumps)."""
+    if isinstance(message, str):
+        return message
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class ConnectionManager:
     """Manages real-time WebSocket connections for MedAgent."""
 
@@ -44,7 +51,7 @@ class ConnectionManager:
         if user_id not in self.active_connections:
             return
 
-        payload = message if isinstance(message, str) else json.dumps(message)
+        payload = _encode(message)
         for connection in self.active_connections[user_id]:
             try:
                 await connection.send_text(payload)
@@ -53,7 +60,7 @@ class ConnectionManager:
 
     async def broadcast_staff(self, message: Union[str, Dict]):
         """Broadcast message to all active staff members (e.g. Audit Logs/Analytics)."""
-        payload = message if isinstance(message, str) else json.dumps(message)
+        payload = _encode(message)
         for connection in list(self.staff_connections):
             try:
                 await connection.send_text(payload)
@@ -63,7 +70,7 @@ class ConnectionManager:
 
     async def broadcast_all(self, message: Union[str, Dict]):
         """Broadcast to every single connected client."""
-        payload = message if isinstance(message, str) else json.dumps(message)
+        payload = _encode(message)
         for user_sockets in self.active_connections.values():
             for connection in list(user_sockets):
                 try:
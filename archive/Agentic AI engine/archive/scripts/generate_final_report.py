@@ -5,26 +5,49 @@ Aggregates tests, health, and status into a developer-facing Report.
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 # Fix python path to allow importing modules from root
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from agents.developer_agent import DeveloperControlAgent
 from agents.self_improvement_agent import SelfImprovementAgent
 
+REPORT_MD = Path("FINAL_SYSTEM_REPORT.md")
+REPORT_JSON = Path("FINAL_SYSTEM_REPORT.json")
+
+
+# Agents open DB/model state on construction; build each once per process
+@lru_cache(maxsize=1)
+def _dev():
+    return DeveloperControlAgent()
 
-def generate_final_report():
-    dev = DeveloperControlAgent()
-    imp = SelfImprovementAgent()
 
-    health = dev.get_system_health()
-    improvement = imp.generate_improvement_report()
+@lru_cache(maxsize=1)
+def _improver():
+    return SelfImprovementAgent()
+
+
+def generate_final_report():
+    health = _dev().get_system_health()
+    improvement = _improver().generate_improvement_report()
+
+    # Structured form for CI consumers; the markdown below is a projection of it
+    data = {
+        "date": "2026-02-14",
+        "version": "5.0.0",
+        "health": health,
+        "improvement": improvement,
+    }
+    REPORT_JSON.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
 
     report = f"""
 # MEDAGENT FINAL SYSTEM STATUS REPORT
-**Date:** 2026-02-14
-**Version:** 5.0.0
+**Date:** {data['date']}
+**Version:** {data['version']}
 
 ## 1. System Health
 - **Overall Status:** {health.get('API', 'Unknown')}
@@ -54,10 +77,9 @@ def generate_final_report():
 - Review "Pending" cases in Admin Dashboard daily.
     """
 
-    with open("FINAL_SYSTEM_REPORT.md", "w", encoding="utf-8") as f:
-        f.write(report.strip())
+    REPORT_MD.write_text(report.strip(), encoding="utf-8")
 
-    print("Report generated: FINAL_SYSTEM_REPORT.md")
+    print(f"Report generated: {REPORT_MD} ({REPORT_JSON})")
 
 
 if __name__ == "__main__":
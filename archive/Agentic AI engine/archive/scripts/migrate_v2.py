@@ -4,10 +4,76 @@ Migration script to update medagent.db with new role-based fields.
 
 import os
 import sqlite3
+import sys
+from pathlib import Path
 
+# Run from project root so the models package resolves
+_root = Path(__file__).resolve().parents[2]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
 
-def migrate():
-    db_path = "medagent.db"
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from database.models import Interaction, MedicalReport, UserAccount
+
+# Enum columns now store SmallInteger codes (EnumCode) instead of names
+ENUM_COLUMNS = [
+    (Interaction.__table__, "review_status"),
+    (MedicalReport.__table__, "status"),
+    (UserAccount.__table__, "role"),
+]
+
+
+def _rebuild_with_enum_codes(cursor, table, col_name):
+    """
+    SQLite cannot change a column's type in place, and the old Enum column is
+    VARCHAR, so codes written into it would stay text. Recreate the table from
+    the model (SMALLINT column), copy rows across mapping names to codes, then
+    swap it in and restore the model's indexes.
+    """
+    info = list(cursor.execute(f"PRAGMA table_info({table.name})"))
+    if not info:
+        print(f"Table {table.name} not found. Skipping.")
+        return
+    old_type = next((row[2] for row in info if row[1] == col_name), "")
+    if old_type.upper() == "SMALLINT":
+        print(f"{table.name}.{col_name} already stores enum codes.")
+        return
+
+    enum_cls = table.c[col_name].type.enum_cls
+    dialect = sqlite.dialect()
+    tmp_name = f"{table.name}_v2"
+    ddl = str(CreateTable(table).compile(dialect=dialect)).replace(
+        f"CREATE TABLE {table.name} (", f"CREATE TABLE {tmp_name} (", 1
+    )
+    cursor.execute(ddl)
+
+    # Copy the columns both schemas share; codes already written as text cast
+    shared = [row[1] for row in info if row[1] in table.c]
+    whens = " ".join(
+        f"WHEN '{member.name}' THEN {code}" for code, member in enumerate(enum_cls)
+    )
+    select = [
+        (
+            f"CASE {col} {whens} ELSE CAST({col} AS INTEGER) END"
+            if col == col_name
+            else col
+        )
+        for col in shared
+    ]
+    cursor.execute(
+        f"INSERT INTO {tmp_name} ({', '.join(shared)}) "
+        f"SELECT {', '.join(select)} FROM {table.name}"
+    )
+    cursor.execute(f"DROP TABLE {table.name}")
+    cursor.execute(f"ALTER TABLE {tmp_name} RENAME TO {table.name}")
+    for index in table.indexes:
+        cursor.execute(str(CreateIndex(index).compile(dialect=dialect)))
+    print(f"Converted {table.name}.{col_name} to enum codes.")
+
+
+def migrate(db_path="medagent.db"):
     if not os.path.exists(db_path):
         print("Database not found. Skipping migration.")
         return
@@ -15,63 +81,63 @@ def migrate():
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # 1. Update user_accounts table
-    columns_to_add = [
-        ("gender", "TEXT"),
-        ("age", "INTEGER"),
-        ("country", "TEXT"),
-        ("interaction_mode", "TEXT DEFAULT 'patient'"),
-        ("doctor_verified", "BOOLEAN DEFAULT 0"),
-        ("license_number", "TEXT"),
-        ("specialization", "TEXT"),
-    ]
+    new_columns = {
+        # 1. Update user_accounts table
+        "user_accounts": [
+            ("gender", "TEXT"),
+            ("age", "INTEGER"),
+            ("country", "TEXT"),
+            ("interaction_mode", "TEXT DEFAULT 'patient'"),
+            ("doctor_verified", "BOOLEAN DEFAULT 0"),
+            ("license_number", "TEXT"),
+            ("specialization", "TEXT"),
+        ],
+        # 2. Update user_sessions table
+        "user_sessions": [("interaction_mode", "TEXT DEFAULT 'patient'")],
+        # 3. Update interactions table with lineage and observability fields
+        "interactions": [
+            ("prompt_version", "TEXT"),
+            ("model_used", "TEXT"),
+            ("confidence_score", "REAL"),
+            ("risk_level", "TEXT"),
+            ("audit_hash", "TEXT"),
+            ("secondary_model", "TEXT"),
+            ("latency_ms", "INTEGER"),
+        ],
+        # Vision analysis results stored with each medical image
+        "medical_images": [
+            ("confidence_score", "INTEGER"),
+            ("severity_level", "TEXT"),
+        ],
+    }
 
-    for col_name, col_type in columns_to_add:
-        try:
-            cursor.execute(
-                f"ALTER TABLE user_accounts ADD COLUMN {col_name} {col_type}"
-            )
-            print(f"Added column {col_name} to user_accounts.")
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" in str(e):
-                print(f"Column {col_name} already exists in user_accounts.")
-            else:
-                print(f"Error adding column {col_name}: {e}")
-
-    # 2. Update user_sessions table
+    # One transaction for every step: a single commit (and fsync) at the end,
+    # and a failure part-way leaves the database untouched
+    cursor.execute("BEGIN IMMEDIATE")
     try:
-        cursor.execute(
-            "ALTER TABLE user_sessions ADD COLUMN interaction_mode TEXT DEFAULT 'patient'"
-        )
-        print("Added column interaction_mode to user_sessions.")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" in str(e):
-            print("Column interaction_mode already exists in user_sessions.")
-        else:
-            print(f"Error adding column interaction_mode: {e}")
-
-    # 3. Update interactions table with lineage and observability fields
-    interaction_columns = [
-        ("prompt_version", "TEXT"),
-        ("model_used", "TEXT"),
-        ("confidence_score", "REAL"),
-        ("risk_level", "TEXT"),
-        ("audit_hash", "TEXT"),
-        ("secondary_model", "TEXT"),
-        ("latency_ms", "INTEGER"),
-    ]
-    for col_name, col_type in interaction_columns:
-        try:
-            cursor.execute(f"ALTER TABLE interactions ADD COLUMN {col_name} {col_type}")
-            print(f"Added column {col_name} to interactions.")
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" in str(e):
-                print(f"Column {col_name} already exists in interactions.")
-            else:
-                print(f"Error adding column {col_name} to interactions: {e}")
-
-    conn.commit()
-    conn.close()
+        for table, columns in new_columns.items():
+            existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+            if not existing:
+                print(f"Table {table} not found. Skipping.")
+                continue
+            for col_name, col_type in columns:
+                if col_name in existing:
+                    print(f"Column {col_name} already exists in {table}.")
+                    continue
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
+                print(f"Added column {col_name} to {table}.")
+
+        # 4. Enum columns now store SmallInteger codes (EnumCode) instead of names
+        for table, col_name in ENUM_COLUMNS:
+            _rebuild_with_enum_codes(cursor, table, col_name)
+
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Migration failed, no changes applied: {e}")
+        return
+    finally:
+        conn.close()
     print("Migration complete.")
 
 
@@ -5,9 +5,24 @@ import signal
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List
 
+import httpx
+
+BACKEND_HEALTH_URL = "http://127.0.0.1:8000/health"
+BACKEND_READY_TIMEOUT = 10.0  # seconds
+BACKEND_POLL_INTERVAL = 0.1  # seconds
+
+# Independent scripts that share no state with each other or the backend
+PARALLEL_STAGES = [
+    ("static_analysis.py", "STATIC ANALYSIS"),
+    ("prompt_test.py", "CLINICAL VALIDATION"),
+    ("security_scan.py", "SECURITY SCAN"),
+]
+
 
 class MEDAgentCIOrchestrator:
     """
@@ -15,6 +30,9 @@ class MEDAgentCIOrchestrator:
     Includes Automated Lifecycle Management for Testing.
     """
 
+    _VERSION_RE = re.compile(r"v\d+\.\d+\.\d+")
+    _VALIDATED_RE = re.compile(r"\*\*Last Validated:\*\*.*")
+
     def __init__(self):
         self.root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         self.start_time = time.time()
@@ -52,7 +70,7 @@ class MEDAgentCIOrchestrator:
         self.log(stage_name, f"{stage_name} Passed", "PASS")
         return True
 
-    def start_backend(self):
+    def start_backend(self) -> bool:
         self.log("SETUP", "Starting MEDAgent Backend for testing...", "INFO")
         self.backend_process = subprocess.Popen(
             [self.python_exe, "-m", "uvicorn", "api.main:app", "--port", "8000"],
@@ -60,8 +78,43 @@ class MEDAgentCIOrchestrator:
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
-        time.sleep(5)
-        self.log("SETUP", "Backend is live on port 8000", "PASS")
+        # Poll /health so setup ends as soon as the app is serving
+        deadline = time.monotonic() + BACKEND_READY_TIMEOUT
+        with httpx.Client(timeout=1.0) as client:
+            while time.monotonic() < deadline:
+                if self.backend_process.poll() is not None:
+                    break
+                try:
+                    if client.get(BACKEND_HEALTH_URL).status_code == 200:
+                        self.log("SETUP", "Backend is live on port 8000", "PASS")
+                        return True
+                except httpx.HTTPError:
+                    pass
+                time.sleep(BACKEND_POLL_INTERVAL)
+        self.log("SETUP", "Backend did not become healthy", "FAIL")
+        return False
+
+    def run_unit_tests(self) -> bool:
+        self.log("TESTING", "Executing Unit Tests (Auth, Core)...")
+        # Output is captured so it does not interleave with the parallel stages
+        result = subprocess.run(
+            [
+                self.python_exe,
+                "-m",
+                "pytest",
+                "tests/test_auth.py",
+                "tests/test_core.py",
+            ],
+            cwd=self.root_dir,
+            capture_output=True,
+            text=True,
+        )
+        print(result.stdout)
+        if result.returncode != 0:
+            print(result.stderr)
+            self.log("TESTING", "Unit tests failed", "FAIL")
+            return False
+        return True
 
     def stop_backend(self):
         if self.backend_process:
@@ -74,28 +127,15 @@ class MEDAgentCIOrchestrator:
         self.log("INIT", "MEDAgent Production-Grade CI/CD Orchestrator Started")
 
         try:
-            if not self.run_stage_script("static_analysis.py", "STATIC ANALYSIS"):
-                return False
-            self.start_backend()
-
-            self.log("TESTING", "Executing Unit Tests (Auth, Core)...")
-            unit_result = subprocess.run(
-                [
-                    self.python_exe,
-                    "-m",
-                    "pytest",
-                    "tests/test_auth.py",
-                    "tests/test_core.py",
-                ],
-                cwd=self.root_dir,
-            )
-            if unit_result.returncode != 0:
-                self.log("TESTING", "Unit tests failed", "FAIL")
-                return False
-
-            if not self.run_stage_script("prompt_test.py", "CLINICAL VALIDATION"):
-                return False
-            if not self.run_stage_script("security_scan.py", "SECURITY SCAN"):
+            # Scans run in worker threads while the backend boots and unit tests run
+            with ThreadPoolExecutor(max_workers=len(PARALLEL_STAGES)) as pool:
+                stages = [
+                    pool.submit(self.run_stage_script, script, name)
+                    for script, name in PARALLEL_STAGES
+                ]
+                tests_ok = self.start_backend() and self.run_unit_tests()
+                wait(stages)
+            if not (tests_ok and all(stage.result() for stage in stages)):
                 return False
 
             self.log(
@@ -127,19 +167,16 @@ class MEDAgentCIOrchestrator:
 
     def update_readme_metadata(self):
         self.log("DOCS", "Updating README Metadata...", "INFO")
-        readme_path = os.path.join(self.root_dir, "README.md")
-        if os.path.exists(readme_path):
-            with open(readme_path, "r", encoding="utf-8") as f:
-                content = f.read()
+        readme_path = Path(self.root_dir, "README.md")
+        if readme_path.exists():
+            original = readme_path.read_text(encoding="utf-8")
 
             now = datetime.now().strftime("%Y-%m-%d %H:%M")
             # Update version if found in header or badges
-            content = re.sub(r"v\d+\.\d+\.\d+", f"v{self.version}", content)
+            content = self._VERSION_RE.sub(f"v{self.version}", original)
 
             if "**Last Validated:**" in content:
-                content = re.sub(
-                    r"\*\*Last Validated:\*\*.*", f"**Last Validated:** {now}", content
-                )
+                content = self._VALIDATED_RE.sub(f"**Last Validated:** {now}", content)
             else:
                 # Insert before License or at end
                 if "## 📜 License" in content:
@@ -149,8 +186,10 @@ class MEDAgentCIOrchestrator:
                 else:
                     content += f"\n\n---\n**Last Validated:** {now}"
 
-            with open(readme_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            if content == original:
+                self.log("DOCS", "README already up to date", "PASS")
+                return
+            readme_path.write_text(content, encoding="utf-8")
             self.log("DOCS", "README synchronized", "PASS")
 
 
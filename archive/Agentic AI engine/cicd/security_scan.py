@@ -2,6 +2,8 @@ import os
 import re
 import sys
 
+SKIP_DIRS = {"venv", ".venv", ".git", "node_modules", "__pycache__"}
+
 
 class MEDAgentSecurityScanner:
     def __init__(self, root_dir):
@@ -13,46 +15,57 @@ class MEDAgentSecurityScanner:
             r"AIza[0-9A-Za-z\\-_]{35}",  # Google API
             r"['\"][0-9a-fA-F]{32}['\"]",  # Symmetric keys
         ]
+        # One alternation compiled once: a single regex pass per file
+        self._secret_re = re.compile("|".join(f"(?:{p})" for p in self.secret_patterns))
+
+    def _walk(self, secrets=True, sqli=True):
+        """Single pass over the tree; each file is read once for every enabled check."""
+        for root, dirs, files in os.walk(self.root_dir):
+            # Prune in place so excluded trees are never descended into
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            check_sqli = sqli and "database" in root
+            for file in files:
+                want_secrets = secrets and file.endswith((".py", ".env", ".txt"))
+                want_sqli = check_sqli and file.endswith(".py")
+                if not (want_secrets or want_sqli):
+                    continue
+                path = os.path.join(root, file)
+                with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                    content = f.read()
+                if want_secrets:
+                    self._check_secrets(path, content)
+                if want_sqli:
+                    self._check_sqli(path, content)
+
+    def _check_secrets(self, path, content):
+        if ".env.example" in path:
+            return
+        if self._secret_re.search(content):
+            self.vulnerabilities.append(f"CRITICAL: Potential secret leaked in {path}")
+
+    def _check_sqli(self, path, content):
+        # Check for f-strings in execute() calls
+        if ".execute(" not in content:
+            return
+        for i, line in enumerate(content.splitlines()):
+            if '.execute(f"' in line or '.execute("' + "{" in line:
+                self.vulnerabilities.append(
+                    f"HIGH: Potential SQLi vulnerable query at {path}:{i+1}"
+                )
 
     def scan_secrets(self):
         print("[1] Scanning for hardcoded secrets...")
-        for root, _, files in os.walk(self.root_dir):
-            if any(x in root for x in ["venv", ".git", "medagent.db"]):
-                continue
-            for file in files:
-                if file.endswith((".py", ".env", ".txt")):
-                    path = os.path.join(root, file)
-                    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                        for pattern in self.secret_patterns:
-                            if re.search(pattern, content):
-                                if ".env.example" in path:
-                                    continue
-                                self.vulnerabilities.append(
-                                    f"CRITICAL: Potential secret leaked in {path}"
-                                )
+        self._walk(sqli=False)
 
     def scan_sqli(self):
         print("[2] Checking for SQL injection patterns...")
-        # Check for f-strings in execute() calls
-        for root, _, files in os.walk(self.root_dir):
-            if "database" not in root:
-                continue
-            for file in files:
-                if file.endswith(".py"):
-                    path = os.path.join(root, file)
-                    with open(path, "r", encoding="utf-8") as f:
-                        lines = f.readlines()
-                        for i, line in enumerate(lines):
-                            if '.execute(f"' in line or '.execute("' + "{" in line:
-                                self.vulnerabilities.append(
-                                    f"HIGH: Potential SQLi vulnerable query at {path}:{i+1}"
-                                )
+        self._walk(secrets=False)
 
     def run_all(self):
         print("--- Running MEDAgent Security Validation ---")
-        self.scan_secrets()
-        self.scan_sqli()
+        print("[1] Scanning for hardcoded secrets...")
+        print("[2] Checking for SQL injection patterns...")
+        self._walk()
 
         if self.vulnerabilities:
             for v in self.vulnerabilities:
@@ -1,6 +1,35 @@
 import ast
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Directory names never analysed; pruned during the walk so they are not descended
+SKIP_DIR_MARKERS = ("venv", ".git", "tests")
+# Allow prints in test/simulation utilities; block in core API and critical agents
+NONPROD_SEGMENTS = (
+    "tests",
+    "scripts",
+    os.path.join("agents", "intelligence"),
+    os.path.join("agents", "prompts"),
+)
+
+
+def _print_call_lines(path):
+    """Line numbers of print() calls in one file (runs in a worker process)."""
+    with open(path, "rb") as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        return None, str(e)
+    lines = [
+        node.lineno
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "print"
+    ]
+    return sorted(lines), None
 
 
 class MEDAgentStaticAnalyzer:
@@ -8,32 +37,35 @@ class MEDAgentStaticAnalyzer:
         self.root_dir = root_dir
         self.errors = []
 
-    def check_print_statements(self):
-        """Checks for print statements instead of logging."""
-        for root, _, files in os.walk(self.root_dir):
-            if "venv" in root or ".git" in root or "tests" in root:
-                continue
+    def _python_files(self):
+        for root, dirs, files in os.walk(self.root_dir):
+            dirs[:] = [
+                d for d in dirs if not any(marker in d for marker in SKIP_DIR_MARKERS)
+            ]
             for file in files:
                 if file.endswith(".py"):
-                    path = os.path.join(root, file)
-                    with open(path, "r", encoding="utf-8") as f:
-                        lines = f.readlines()
-                    for i, line in enumerate(lines):
-                        if "print(" in line and "def " not in line:
-                            # Allow prints in test/simulation utilities; block in core API and critical agents
-                            is_nonprod = any(
-                                seg in path
-                                for seg in [
-                                    "tests",
-                                    "scripts",
-                                    "agents\\intelligence",
-                                    "agents\\prompts",
-                                ]
-                            )
-                            if "api" in path or ("agents" in path and not is_nonprod):
-                                self.errors.append(
-                                    f"STRICT: print() found in production code: {path}:{i+1}"
-                                )
+                    yield os.path.join(root, file)
+
+    def _is_production(self, path):
+        is_nonprod = any(seg in path for seg in NONPROD_SEGMENTS)
+        return "api" in path or ("agents" in path and not is_nonprod)
+
+    def check_print_statements(self):
+        """Checks for print statements instead of logging."""
+        # Only production files can fail this check, so only those are parsed
+        paths = [p for p in self._python_files() if self._is_production(p)]
+        with ProcessPoolExecutor() as pool:
+            results = pool.map(_print_call_lines, paths, chunksize=16)
+            for path, (lines, syntax_error) in zip(paths, results):
+                if syntax_error:
+                    self.errors.append(
+                        f"STRICT: could not parse {path}: {syntax_error}"
+                    )
+                    continue
+                for lineno in lines:
+                    self.errors.append(
+                        f"STRICT: print() found in production code: {path}:{lineno}"
+                    )
 
     def check_unused_imports(self):
         """Simple check for unused imports using ast."""
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -25,6 +26,7 @@ class Settings(BaseSettings):
     DATA_DIR: Path = BASE_DIR / "data"
     RAG_DIR: Path = BASE_DIR / "rag"
     INDEX_DIR: Path = RAG_DIR / "faiss_index"
+    EMBEDDING_CACHE_PATH: Path = RAG_DIR / "embedding_cache.sqlite"
 
     # Medical Data
     MEDICAL_GUIDELINES_PATH: Path = DATA_DIR / "medical_guidelines.json"
@@ -34,6 +36,15 @@ class Settings(BaseSettings):
     RAG_CHUNK_OVERLAP: int = 50
     RAG_TOP_K: int = 3
     RAG_RELEVANCE_THRESHOLD: float = 0.5  # Increased for safety
+    RAG_CACHE_TTL: int = 3600  # seconds; exact and semantic query caches
+    RAG_CACHE_SIZE: int = 1024  # exact-match answers and query embeddings
+    RAG_SEM_CACHE_SIZE: int = 256  # paraphrase cache rows (ring buffer)
+    RAG_SEM_CACHE_THRESHOLD: float = 0.97  # cosine similarity for a paraphrase hit
+    RAG_EMBED_BATCH_SIZE: int = 512  # chunk texts per embeddings request at build
+    RAG_EMBED_CONCURRENCY: int = 8  # embeddings requests in flight at build
+    RAG_EMBED_MAX_RETRIES: int = 5  # rate-limited request retries, backing off 2^n s
+    RAG_IVF_MIN_VECTORS: int = 10_000  # below this, exact flat search is faster
+    RAG_NPROBE: int = 8  # inverted lists scanned per query once IVF is in use
 
     # LLM Configuration
     LLM_TEMPERATURE_DIAGNOSIS: float = 0.0  # Strict for reasoning
@@ -57,12 +68,16 @@ class Settings(BaseSettings):
     # Security
     DATA_ENCRYPTION_KEY: Optional[str] = None
     ADMIN_API_KEY: Optional[str] = None
+    BCRYPT_ROUNDS: int = 12  # cost factor for new password hashes
     AUDIT_SIGNING_KEY: Optional[str] = None
 
     # Monitoring
     MLFLOW_TRACKING_URI: Optional[str] = None
     ENABLE_LOGGING: bool = True
     LOG_LEVEL: str = "INFO"
+    OTEL_EXPORTER_OTLP_ENDPOINT: Optional[str] = None  # e.g. http://collector:4317
+    OTEL_CONSOLE_EXPORT: bool = False  # dev only: print spans to stdout
+    STRICT_ORM_LOADING: bool = False  # dev/tests: lazy relationship loads raise
 
     # --- MODEL ROUTING ---
     MODEL_MODE: str = "cloud"  # cloud | local
@@ -77,6 +92,9 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./medagent.db"
+    DB_POOL_SIZE: int = 20  # async engine connections kept open per worker
+    DB_MAX_OVERFLOW: int = 30  # extra connections allowed under burst load
+    DB_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
 
     # API
     MEDAGENT_API_URL: str = "http://localhost:8000"
@@ -85,6 +103,8 @@ class Settings(BaseSettings):
         "http://localhost:8000",
         "http://localhost:8501",
     ]
+    # Worker threads for run_in_threadpool / to_thread (crypto, bcrypt, rendering)
+    THREADPOOL_SIZE: int = 64
 
     # Feature Flags
     ENABLE_AUDIO: bool = False
@@ -116,6 +136,8 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
+# Prompts do not move at runtime; only successful lookups are cached
+@lru_cache(maxsize=256)
 def get_prompt_path(filename: str) -> Path:
     """Get absolute path to a prompt file with validation."""
     path = settings.PROMPTS_DIR / filename
@@ -129,10 +151,13 @@ def get_prompt_path(filename: str) -> Path:
 
 def ensure_directories():
     """Ensure all required directories exist."""
-    settings.PROMPTS_DIR.mkdir(exist_ok=True)
-    settings.DATA_DIR.mkdir(exist_ok=True)
-    settings.RAG_DIR.mkdir(exist_ok=True)
-    settings.INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    for directory in (
+        settings.PROMPTS_DIR,
+        settings.DATA_DIR,
+        settings.RAG_DIR,
+        settings.INDEX_DIR,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
 
 
 # Initialize directories on import
@@ -1,9 +1,9 @@
-import json
-import random
+import csv
 import sys
 from pathlib import Path
 
-import pandas as pd
+import numpy as np
+import orjson
 from faker import Faker
 
 # Run from project root so config and paths resolve
@@ -13,7 +13,88 @@ if str(_root) not in sys.path:
 
 from config import settings
 
-fake = Faker()
+# Building a Faker loads every provider; keep one instance per locale
+_FAKER_CACHE = {}
+
+
+def get_faker(locale: str = "en_US") -> Faker:
+    faker = _FAKER_CACHE.get(locale)
+    if faker is None:
+        faker = _FAKER_CACHE[locale] = Faker(locale)
+    return faker
+
+
+fake = get_faker()
+
+
+# High-Resolution Medical Protocols (Expanded); constant, so encoded once at import
+GUIDELINES = (
+    {
+        "category": "Cardiology",
+        "condition": "Acute Myocardial Infarction (Heart Attack)",
+        "guideline": "Immediate diagnosis via ECG and Troponin levels. Time-to-reperfusion is critical.",
+        "indicators": "Substernal chest pain, radiating to left arm/jaw, diaphoresis (sweating), nausea, dyspnea.",
+        "treatment": "Aspirin 325mg (chewed), Nitroglycerin (if SBP >90), immediate transport to PCI center.",
+    },
+    {
+        "category": "Endocrinology",
+        "condition": "Diabetic Ketoacidosis (DKA)",
+        "guideline": "Emergency life-threatening condition in type 1/2 diabetes.",
+        "indicators": "Fruity breath odor (acetone), Kussmaul respirations, polyuria, polydipsia, confusion.",
+        "treatment": "IV fluid resuscitation (Normal Saline), Insulin infusion 0.1U/kg/hr, Potassium replacement.",
+    },
+    {
+        "category": "Respiratory",
+        "condition": "Pneumonia",
+        "guideline": "Infection of lung parenchyma. Differentiate between CAP and HAP via history.",
+        "indicators": "Productive cough (rusty or green sputum), pleuritic chest pain, fever, rales/crackles on auscultation.",
+        "treatment": "Empiric antibiotics (e.g., Azithromycin + Ceftriaxone for CAP). CURB-65 score for admission.",
+    },
+    {
+        "category": "Neurology",
+        "condition": "Ischemic Stroke",
+        "guideline": "Time is Brain. Window for thrombolysis (tPA) is 4.5 hours from Last Known Well.",
+        "indicators": "Facial drooping, arm weakness, speech difficulty (FAST), visual field defects.",
+        "treatment": "CT scan without contrast to rule out hemorrhage. Stabilize BP. Thrombectomy evaluation.",
+    },
+    {
+        "category": "Gastroenterology",
+        "condition": "Acute Appendicitis",
+        "guideline": "Most common surgical emergency. High risk of perforation if delayed >24h.",
+        "indicators": "Periumbilical pain migrating to Right Lower Quadrant (McBurney's point), guarding, rebound tenderness.",
+        "treatment": "NPO (Nothing by mouth), IV antibiotics, surgical appendectomy.",
+    },
+    {
+        "category": "Respiratory",
+        "condition": "Asthma Exacerbation",
+        "guideline": "Reversible airway obstruction. Monitor SpO2 and Peak Flow.",
+        "indicators": "Wheezing, accessory muscle use, 'silent chest' is an ominous sign.",
+        "treatment": "SABA (Albuterol) nebulizer, systemic corticosteroids (Prednisone), Oxygen.",
+    },
+    {
+        "category": "Infectious Disease",
+        "condition": "Sepsis",
+        "guideline": "Dysregulated host response to infection. High mortality rate.",
+        "indicators": "qSOFA score >= 2 (Altered mental status, SBP <=100, RR >=22). Hypothermia or fever.",
+        "treatment": "Sepsis 3-hour bundle: Lactate level, Blood cultures, Broad-spectrum antibiotics, Fluid bolus.",
+    },
+    # --- ARABIC PROTOCOLS (Bilingual Grounding) ---
+    {
+        "category": "Cardiology",
+        "condition": "Acute Myocardial Infarction / نوبة قلبية حادة",
+        "guideline": "التشخيص الفوري عبر تخطيط القلب ومستويات التروبونين. الوقت حاسم لإعادة التروية.",
+        "indicators": "ألم خلف القص، يمتد إلى الذراع اليسرى/الفك، تعرق، غثيان، ضيق تنفس.",
+        "treatment": "الأسبرين 325 ملجم (مضغ)، نيتروجليسرين، النقل الفوري لمركز قسطرة.",
+    },
+    {
+        "category": "Neurology",
+        "condition": "Ischemic Stroke / سكتة دماغية نقص تروية",
+        "guideline": "الوقت هو الدماغ. نافذة حل الخثرة هي 4.5 ساعة.",
+        "indicators": "تدلي الوجه، ضعف الذراع، صعوبة النطق (FAST).",
+        "treatment": "الأشعة المقطعية بدون صبغة لاستبعاد النزيف. تثبيت ضغط الدم.",
+    },
+)
+GUIDELINES_JSON = orjson.dumps(GUIDELINES, option=orjson.OPT_INDENT_2)
 
 
 def generate_professional_data():
@@ -23,95 +104,42 @@ def generate_professional_data():
     settings.DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     # 1. High-Resolution Medical Protocols (Expanded)
-    guidelines = [
-        {
-            "category": "Cardiology",
-            "condition": "Acute Myocardial Infarction (Heart Attack)",
-            "guideline": "Immediate diagnosis via ECG and Troponin levels. Time-to-reperfusion is critical.",
-            "indicators": "Substernal chest pain, radiating to left arm/jaw, diaphoresis (sweating), nausea, dyspnea.",
-            "treatment": "Aspirin 325mg (chewed), Nitroglycerin (if SBP >90), immediate transport to PCI center.",
-        },
-        {
-            "category": "Endocrinology",
-            "condition": "Diabetic Ketoacidosis (DKA)",
-            "guideline": "Emergency life-threatening condition in type 1/2 diabetes.",
-            "indicators": "Fruity breath odor (acetone), Kussmaul respirations, polyuria, polydipsia, confusion.",
-            "treatment": "IV fluid resuscitation (Normal Saline), Insulin infusion 0.1U/kg/hr, Potassium replacement.",
-        },
-        {
-            "category": "Respiratory",
-            "condition": "Pneumonia",
-            "guideline": "Infection of lung parenchyma. Differentiate between CAP and HAP via history.",
-            "indicators": "Productive cough (rusty or green sputum), pleuritic chest pain, fever, rales/crackles on auscultation.",
-            "treatment": "Empiric antibiotics (e.g., Azithromycin + Ceftriaxone for CAP). CURB-65 score for admission.",
-        },
-        {
-            "category": "Neurology",
-            "condition": "Ischemic Stroke",
-            "guideline": "Time is Brain. Window for thrombolysis (tPA) is 4.5 hours from Last Known Well.",
-            "indicators": "Facial drooping, arm weakness, speech difficulty (FAST), visual field defects.",
-            "treatment": "CT scan without contrast to rule out hemorrhage. Stabilize BP. Thrombectomy evaluation.",
-        },
-        {
-            "category": "Gastroenterology",
-            "condition": "Acute Appendicitis",
-            "guideline": "Most common surgical emergency. High risk of perforation if delayed >24h.",
-            "indicators": "Periumbilical pain migrating to Right Lower Quadrant (McBurney's point), guarding, rebound tenderness.",
-            "treatment": "NPO (Nothing by mouth), IV antibiotics, surgical appendectomy.",
-        },
-        {
-            "category": "Respiratory",
-            "condition": "Asthma Exacerbation",
-            "guideline": "Reversible airway obstruction. Monitor SpO2 and Peak Flow.",
-            "indicators": "Wheezing, accessory muscle use, 'silent chest' is an ominous sign.",
-            "treatment": "SABA (Albuterol) nebulizer, systemic corticosteroids (Prednisone), Oxygen.",
-        },
-        {
-            "category": "Infectious Disease",
-            "condition": "Sepsis",
-            "guideline": "Dysregulated host response to infection. High mortality rate.",
-            "indicators": "qSOFA score >= 2 (Altered mental status, SBP <=100, RR >=22). Hypothermia or fever.",
-            "treatment": "Sepsis 3-hour bundle: Lactate level, Blood cultures, Broad-spectrum antibiotics, Fluid bolus.",
-        },
-        # --- ARABIC PROTOCOLS (Bilingual Grounding) ---
-        {
-            "category": "Cardiology",
-            "condition": "Acute Myocardial Infarction / نوبة قلبية حادة",
-            "guideline": "التشخيص الفوري عبر تخطيط القلب ومستويات التروبونين. الوقت حاسم لإعادة التروية.",
-            "indicators": "ألم خلف القص، يمتد إلى الذراع اليسرى/الفك، تعرق، غثيان، ضيق تنفس.",
-            "treatment": "الأسبرين 325 ملجم (مضغ)، نيتروجليسرين، النقل الفوري لمركز قسطرة.",
-        },
-        {
-            "category": "Neurology",
-            "condition": "Ischemic Stroke / سكتة دماغية نقص تروية",
-            "guideline": "الوقت هو الدماغ. نافذة حل الخثرة هي 4.5 ساعة.",
-            "indicators": "تدلي الوجه، ضعف الذراع، صعوبة النطق (FAST).",
-            "treatment": "الأشعة المقطعية بدون صبغة لاستبعاد النزيف. تثبيت ضغط الدم.",
-        },
-    ]
-
-    with open(settings.MEDICAL_GUIDELINES_PATH, "w", encoding="utf-8") as f:
-        json.dump(guidelines, f, indent=4)
+    settings.MEDICAL_GUIDELINES_PATH.write_bytes(GUIDELINES_JSON)
     print(f"Generated {settings.MEDICAL_GUIDELINES_PATH}")
 
     # 2. Synthetic Patient History for long-term memory testing
-    patients = []
-    conditions = ["Hypertension", "Type 2 Diabetes", "Asthma", "CKD Stage 2", "None"]
-    for _ in range(100):
-        patients.append(
-            {
-                "patient_id": fake.uuid4(),
-                "name": fake.name(),
-                "age": random.randint(18, 85),
-                "gender": random.choice(["Male", "Female"]),
-                "chronic_conditions": random.sample(conditions, random.randint(1, 2)),
-                "last_bp": f"{random.randint(110, 160)}/{random.randint(70, 100)}",
-                "last_hba1c": round(random.uniform(5.5, 9.0), 1),
-            }
-        )
-    pd.DataFrame(patients).to_csv(
-        settings.DATA_DIR / "patient_registry.csv", index=False
+    conditions = np.array(
+        ["Hypertension", "Type 2 Diabetes", "Asthma", "CKD Stage 2", "None"],
+        dtype=object,
     )
+    n = 100
+    rng = np.random.default_rng()
+    # Build columns directly; no per-row dicts to transpose
+    sbp = rng.integers(110, 161, n)
+    dbp = rng.integers(70, 101, n)
+    # One or two distinct conditions per patient: argsort of random keys gives a
+    # per-row shuffle in a single call, then gather the first two names
+    picked = conditions[rng.random((n, len(conditions))).argsort(axis=1)[:, :2]]
+    n_conditions = rng.integers(1, 3, n)
+    patients = {
+        "patient_id": [fake.uuid4() for _ in range(n)],
+        "name": [fake.name() for _ in range(n)],
+        "age": rng.integers(18, 86, n).tolist(),
+        "gender": rng.choice(["Male", "Female"], n).tolist(),
+        "chronic_conditions": [
+            row[:k].tolist() for row, k in zip(picked, n_conditions)
+        ],
+        "last_bp": [f"{s}/{d}" for s, d in zip(sbp, dbp)],
+        "last_hba1c": np.round(rng.uniform(5.5, 9.0, n), 1).tolist(),
+    }
+    # csv.writer over the columns avoids pandas' per-cell to_csv conversion;
+    # it quotes the same fields (names and condition lists with commas)
+    with open(
+        settings.DATA_DIR / "patient_registry.csv", "w", newline="", encoding="utf-8"
+    ) as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(patients)
+        writer.writerows(zip(*patients.values()))
     print(f"Generated {settings.DATA_DIR / 'patient_registry.csv'}")
 
 
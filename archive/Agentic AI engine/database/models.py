@@ -2,12 +2,17 @@ import datetime
 import enum
 from contextlib import contextmanager
 
-from sqlalchemy import (JSON, Boolean, Column, DateTime, Enum, Float,
-                        ForeignKey, Integer, String, Text, create_engine)
+from sqlalchemy import (JSON, Boolean, Column, DateTime, Float, ForeignKey,
+                        Index, Integer, SmallInteger, String, Text,
+                        TypeDecorator, create_engine)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
 Base = declarative_base()
 
+# Binary JSONB on Postgres (parsed once, GIN-indexable); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB, "postgresql")
+
 
 class ReviewStatus(str, enum.Enum):
     PENDING = "pending"
@@ -24,6 +29,38 @@ class UserRole(str, enum.Enum):
     DOCTOR = "doctor"
 
 
+class EnumCode(TypeDecorator):
+    """
+    Stores a str Enum as a SmallInteger code (its declaration index) instead of
+    the member name, so new members must be appended, never inserted.
+    Rows written as names before the switch, and codes stored as text in a
+    legacy VARCHAR column, still load.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._members = tuple(enum_cls)
+        self._codes = {m: i for i, m in enumerate(self._members)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._codes[self.enum_cls(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            if not value.isdigit():
+                return self.enum_cls[value]
+            value = int(value)
+        return self._members[value]
+
+
 class FeedbackRating(int, enum.Enum):
     ONE = 1
     TWO = 2
@@ -44,10 +81,6 @@ class UserSession(Base):
     language = Column(String, default="en")  # en or ar
     interaction_mode = Column(String, default="patient")  # patient or doctor
 
-    logs = relationship("SystemLog", back_populates="session")
-    interactions = relationship("Interaction", back_populates="session")
-    feedback = relationship("UserFeedback", back_populates="session")
-
 
 class MedicalCase(Base):
     """Groups related interactions into a single medical case."""
@@ -65,11 +98,18 @@ class MedicalCase(Base):
         DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
     )
 
-    interactions = relationship("Interaction", back_populates="case")
-
 
 class Interaction(Base):
     __tablename__ = "interactions"
+    __table_args__ = (
+        # Serves the newest-first human review queue (keyset on id)
+        Index("ix_interactions_review_queue", "requires_human_review", "id"),
+        # Session transcript in timestamp order (history, chat context)
+        Index("ix_interactions_session_time", "session_id", "timestamp"),
+        # Covers the analytics overview aggregate (risk counts, avg latency) so
+        # it scans this narrow index instead of the wide encrypted rows
+        Index("ix_interactions_risk_latency", "risk_level", "latency_ms"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String, ForeignKey("user_sessions.id"))
@@ -83,8 +123,8 @@ class Interaction(Base):
     final_response_encrypted = Column(Text)
     language = Column(String, default="en")
 
-    metadata_json = Column(JSON)
-    safety_flags = Column(JSON)
+    metadata_json = Column(JSONType)
+    safety_flags = Column(JSONType)
 
     # Observability & Lineage
     prompt_version = Column(String, nullable=True)
@@ -99,13 +139,10 @@ class Interaction(Base):
     # Review Workflow
     requires_human_review = Column(Boolean, default=False)
     review_status = Column(
-        Enum(ReviewStatus), default=ReviewStatus.APPROVED
+        EnumCode(ReviewStatus), default=ReviewStatus.APPROVED
     )  # Auto-approved unless flagged
     reviewer_comment = Column(Text, nullable=True)
 
-    session = relationship("UserSession", back_populates="interactions")
-    case = relationship("MedicalCase", back_populates="interactions")
-
 
 class UserFeedback(Base):
     __tablename__ = "user_feedback"
@@ -117,8 +154,6 @@ class UserFeedback(Base):
     comment = Column(Text, nullable=True)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
 
-    session = relationship("UserSession", back_populates="feedback")
-
 
 class Feedback(Base):
     """Enhanced clinical feedback table for RLHF."""
@@ -138,22 +173,22 @@ class Feedback(Base):
     rating = Column(Integer)  # 0-5
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
 
-    # Relationships
-    user = relationship("UserAccount")
-    case = relationship("MedicalCase")
-
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Per-actor audit trail, newest first
+        Index("ix_audit_logs_actor_time", "actor_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(DateTime, default=datetime.datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.datetime.utcnow, index=True)
     actor_id = Column(String)
     role = Column(String)
     action = Column(String)
     resource_target = Column(String)
     status = Column(String)
-    details = Column(JSON, nullable=True)  # Specific details of the change
+    details = Column(JSONType, nullable=True)  # Specific details of the change
     ip_address = Column(String, nullable=True)
 
 
@@ -183,11 +218,9 @@ class SystemLog(Base):
     level = Column(String)
     component = Column(String)
     message = Column(Text)
-    details = Column(JSON)
+    details = Column(JSONType)
     session_id = Column(String, ForeignKey("user_sessions.id"), nullable=True)
 
-    session = relationship("UserSession", back_populates="logs")
-
 
 class PatientProfile(Base):
     __tablename__ = "patient_profiles"
@@ -211,6 +244,10 @@ class PatientProfile(Base):
 
 class MedicalReport(Base):
     __tablename__ = "medical_reports"
+    __table_args__ = (
+        # Per-patient report history (latest version / newest first)
+        Index("ix_medical_reports_patient_time", "patient_id", "generated_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     patient_id = Column(String, ForeignKey("patient_profiles.id"))
@@ -223,11 +260,10 @@ class MedicalReport(Base):
 
     # Versioning & Status
     version = Column(Integer, default=1)
-    status = Column(Enum(ReviewStatus), default=ReviewStatus.PENDING)
+    status = Column(EnumCode(ReviewStatus), default=ReviewStatus.PENDING)
     generated_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     patient = relationship("PatientProfile", back_populates="reports")
-    session = relationship("UserSession")
 
 
 class UserAccount(Base):
@@ -242,7 +278,7 @@ class UserAccount(Base):
     full_name_encrypted = Column(Text)
     password_hash = Column(String)
 
-    role = Column(Enum(UserRole), default=UserRole.PATIENT)
+    role = Column(EnumCode(UserRole), default=UserRole.PATIENT)
     gender = Column(String, nullable=True)  # Male, Female, Prefer not to say
     age = Column(Integer, nullable=True)
     country = Column(String, nullable=True)
@@ -297,18 +333,20 @@ class UserAction(Base):
 
     action_type = Column(String)  # CLICK, VIEW, SELECT, EXPORT
     element_id = Column(String)  # UI button id or feature name
-    details = Column(JSON)  # Additional context (e.g. which report, which language)
+    details = Column(JSONType)  # Additional context (e.g. which report, which language)
 
     version = Column(String, default="5.0.0")  # MedAgent version
     audit_tag = Column(String)  # Tag for auditing (e.g. "SECURITY", "UX")
 
-    session = relationship("UserSession")
-
 
 class MedicalImage(Base):
     """Stores metadata and analysis for user-uploaded medical images."""
 
     __tablename__ = "medical_images"
+    __table_args__ = (
+        # Serves the per-patient, newest-first keyset listing in /clinical/images
+        Index("ix_medical_images_patient_id", "patient_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String, ForeignKey("user_sessions.id"))
@@ -322,7 +360,9 @@ class MedicalImage(Base):
 
     # Analysis results
     visual_findings_encrypted = Column(Text)
-    possible_conditions_json = Column(JSON)
+    possible_conditions_json = Column(JSONType)
+    confidence_score = Column(Integer, nullable=True)  # Percentage 0-100
+    severity_level = Column(String, nullable=True)  # low, moderate, high, critical
 
     requires_human_review = Column(Boolean, default=False)
 
@@ -331,6 +371,10 @@ class SymptomLog(Base):
     """Tracks patient symptoms and severity over time."""
 
     __tablename__ = "symptom_logs"
+    __table_args__ = (
+        # Per-patient symptom timeline, newest first
+        Index("ix_symptom_logs_patient_time", "patient_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     patient_id = Column(String, ForeignKey("patient_profiles.id"))
@@ -347,6 +391,10 @@ class MedicationRecord(Base):
     """Tracks patient medications and adherence."""
 
     __tablename__ = "medication_records"
+    __table_args__ = (
+        # Active medications per patient
+        Index("ix_medication_records_patient_active", "patient_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     patient_id = Column(String, ForeignKey("patient_profiles.id"))
@@ -366,20 +414,21 @@ class MedicationRecord(Base):
     severity_level = Column(String)  # low, moderate, high
     requires_human_review = Column(Boolean, default=False)
 
-    session = relationship("UserSession")
-    case = relationship("MedicalCase")
-
 
 class MemoryNode(Base):
     """Nodes for the User Memory Graph."""
 
     __tablename__ = "memory_nodes"
+    __table_args__ = (
+        # Recent memory-graph nodes per user
+        Index("ix_memory_nodes_user_time", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("user_accounts.id"))
     node_type = Column(String)  # Symptom, Diagnosis, Image, Report, Medication, Case
     content_encrypted = Column(Text)
-    metadata_json = Column(JSON)
+    metadata_json = Column(JSONType)
 
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
@@ -404,6 +453,10 @@ class Medication(Base):
     """Tracks patient medications."""
 
     __tablename__ = "medications"
+    __table_args__ = (
+        # Active medications per user
+        Index("ix_medications_user_active", "user_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("user_accounts.id"))
@@ -421,6 +474,10 @@ class Reminder(Base):
     """Tracks medication or appointment reminders."""
 
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Enabled reminders per user
+        Index("ix_reminders_user_enabled", "user_id", "is_enabled"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("user_accounts.id"))
@@ -433,15 +490,38 @@ class Reminder(Base):
     medication = relationship("Medication", back_populates="reminders")
 
 
+import orjson
 from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
                                     create_async_engine)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import settings
 
 DATABASE_URL = "sqlite+aiosqlite:///./medagent.db"
 
+
+def _json_dumps(value) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Shared by both engines so the sync legacy path gets the same pooling and codecs
+_ENGINE_KWARGS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    # Compiled-statement cache; default 500 is tight across both engines
+    query_cache_size=1200,
+    # JSON columns (metadata_json, safety_flags, details) encode/decode in C
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+)
+
 engine = create_async_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
-    pool_pre_ping=True,
+    poolclass=AsyncAdaptedQueuePool,
+    **_ENGINE_KWARGS,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -454,13 +534,20 @@ AsyncSessionLocal = async_sessionmaker(
 
 
 async def init_db():
+    """
+    Create any missing tables. Deliberately not run at import or app startup;
+    scripts/init_db.py calls it (run_system.py only when medagent.db is missing).
+    """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 # Synchronous legacy support (for migration phase if needed)
 sync_engine = create_engine(
-    "sqlite:///./medagent.db", connect_args={"check_same_thread": False}
+    "sqlite:///./medagent.db",
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    **_ENGINE_KWARGS,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
@@ -5,14 +5,27 @@ Or: python evaluation/test_system.py
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
+
 # Ensure project root is on path
 _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
 
+@lru_cache(maxsize=1)
+def _client():
+    """One app import and TestClient for the whole run (pytest or __main__)."""
+    from fastapi.testclient import TestClient
+
+    from api.main import app
+
+    return TestClient(app)
+
+
 def test_imports():
     """Verify core modules can be imported."""
     from config import settings
@@ -30,43 +43,32 @@ def test_imports():
     assert "messages" in AgentState.__annotations__
 
 
-def test_health_endpoint():
-    """Verify / and /health return 200."""
-    from fastapi.testclient import TestClient
-
-    from api.main import app
-
-    client = TestClient(app)
-    r = client.get("/")
-    assert r.status_code == 200
-    assert "version" in r.json()
-    r2 = client.get("/health")
-    assert r2.status_code == 200
-    assert r2.json().get("status") == "ok"
-
-
-def test_ready_without_api_key():
-    """Without OPENAI_API_KEY, /ready should return 503."""
-    from fastapi.testclient import TestClient
-
-    from api.main import app
-
-    client = TestClient(app)
-    r = client.get("/ready")
+# (method, path, json body, accepted status codes, expected response fields);
+# a field expected as ... only has to be present
+HTTP_CASES = [
+    ("GET", "/", None, {200}, {"version": ...}),
+    ("GET", "/health", None, {200}, {"status": "ok"}),
     # 503 when orchestrator cannot be created (e.g. missing API key)
-    assert r.status_code in (503, 200)
-    assert "version" in r.json()
-
-
-def test_consult_validation():
-    """Invalid input to /consult should return 422."""
-    from fastapi.testclient import TestClient
-
-    from api.main import app
-
-    client = TestClient(app)
-    r = client.post("/consult", json={"symptoms": ""})
-    assert r.status_code == 422  # Pydantic validation error for empty string
+    ("GET", "/ready", None, {200, 503}, {"version": ...}),
+    # Pydantic validation error for empty string
+    ("POST", "/consult", {"symptoms": ""}, {422}, {}),
+]
+
+
+@pytest.mark.parametrize(
+    "method,path,payload,codes,fields",
+    HTTP_CASES,
+    ids=[f"{method} {path}" for method, path, *_ in HTTP_CASES],
+)
+def test_http_endpoint(method, path, payload, codes, fields):
+    """Status codes and key response fields of the public endpoints."""
+    r = _client().request(method, path, json=payload)
+    assert r.status_code in codes
+    body = r.json()
+    for key, value in fields.items():
+        assert key in body
+        if value is not ...:
+            assert body[key] == value
 
 
 def test_agent_response_schema():
@@ -100,12 +102,9 @@ def test_report_agent_import():
 if __name__ == "__main__":
     test_imports()
     print("test_imports OK")
-    test_health_endpoint()
-    print("test_health_endpoint OK")
-    test_ready_without_api_key()
-    print("test_ready_without_api_key OK")
-    test_consult_validation()
-    print("test_consult_validation OK")
+    for case in HTTP_CASES:
+        test_http_endpoint(*case)
+        print(f"test_http_endpoint {case[0]} {case[1]} OK")
     test_agent_response_schema()
     print("test_agent_response_schema OK")
     test_report_agent_import()
@@ -1,9 +1,11 @@
 import datetime
-import json
 import logging
 import os
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,8 +24,7 @@ class ModelRegistry:
 
     def _load_registry(self):
         if os.path.exists(self.registry_path):
-            with open(self.registry_path, "r") as f:
-                self.data = json.load(f)
+            self.data = orjson.loads(Path(self.registry_path).read_bytes())
         else:
             self.data = {
                 "current_model": "base",
@@ -39,8 +40,9 @@ class ModelRegistry:
             self._save_registry()
 
     def _save_registry(self):
-        with open(self.registry_path, "w") as f:
-            json.dump(self.data, f, indent=2)
+        Path(self.registry_path).write_bytes(
+            orjson.dumps(self.data, option=orjson.OPT_INDENT_2)
+        )
 
     def register_model(
         self, version: str, checkpoint_path: str, metrics: Dict[str, Any]
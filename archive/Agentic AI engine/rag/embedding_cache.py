@@ -0,0 +1,95 @@
+"""
+Persistent embedding cache for RAG index builds.
+Vectors are keyed by sha256(model + NUL + text), so a rebuild only sends new or
+changed chunks to the embeddings API and a model switch never reuses old vectors.
+"""
+
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+# Stay well under SQLite's bound-parameter limit per IN (...) lookup
+_LOOKUP_CHUNK = 500
+
+
+class EmbeddingCache:
+    """SQLite table of float32 vectors keyed by content hash."""
+
+    def __init__(self, path: Path, model: str):
+        self.path = Path(path)
+        self.model = model
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, vec BLOB)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model}\0{text}".encode()).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        hits = {}
+        with self._connect() as conn:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i : i + _LOOKUP_CHUNK]
+                rows = conn.execute(
+                    "SELECT key, vec FROM cache WHERE key IN "
+                    f"({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, vec in rows:
+                    hits[key] = np.frombuffer(vec, dtype=np.float32)
+        return hits
+
+    def put_many(self, items: Dict[bytes, Sequence[float]]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, vec) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vec, dtype=np.float32).tobytes())
+                    for key, vec in items.items()
+                ],
+            )
+
+    def embed_documents(
+        self,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], List[List[float]]],
+        batch_size: int,
+        concurrency: int = 1,
+    ) -> List[np.ndarray]:
+        """
+        Vectors for texts in order; only cache misses go to embed, batch_size
+        texts per call with up to concurrency calls in flight, and are written
+        back before returning.
+        """
+        keys = [self.key(text) for text in texts]
+        vectors = self.get_many(list(set(keys)))
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            miss_keys = list(missing)
+            miss_texts = list(missing.values())
+            starts = range(0, len(miss_texts), batch_size)
+            batches = [miss_texts[i : i + batch_size] for i in starts]
+            if concurrency > 1 and len(batches) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(concurrency, len(batches))
+                ) as pool:
+                    results = list(pool.map(embed, batches))
+            else:
+                results = [embed(batch) for batch in batches]
+            fresh = {}
+            for i, batch in zip(starts, results):
+                fresh.update(zip(miss_keys[i : i + batch_size], batch))
+            self.put_many(fresh)
+            vectors.update(
+                (key, np.asarray(vec, dtype=np.float32)) for key, vec in fresh.items()
+            )
+        return [vectors[key] for key in keys]
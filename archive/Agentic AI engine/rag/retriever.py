@@ -2,20 +2,143 @@
 Medical RAG Retriever with Configurable Paths and Enhanced Error Handling.
 """
 
-import json
+import hashlib
 import logging
+import math
 import os
+import shutil
+import tempfile
+import threading
+import time
 from pathlib import Path
 
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
+
 from config import settings
+from rag.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+# Part of the index fingerprint; bump when the stored index layout changes
+_INDEX_FORMAT = "ip-sqfp16"
+
+
+def _query_key(query: str) -> str:
+    """Case- and whitespace-insensitive cache key for a query."""
+    return hashlib.sha256(" ".join(query.lower().split()).encode()).hexdigest()
+
+
+def _relevance_to_cosine(threshold: float) -> float:
+    """
+    RAG_RELEVANCE_THRESHOLD was tuned on LangChain's L2 relevance,
+    1 - ||a - b||^2 / sqrt(2); for unit vectors that equals this cosine cutoff.
+    """
+    return 1.0 - (1.0 - threshold) / math.sqrt(2)
+
+
+class _OpenAIEmbeddings:
+    """Embeddings straight from the OpenAI SDK, one request per call."""
+
+    def __init__(self, model: str, api_key: str):
+        from openai import OpenAI
+
+        self.model = model
+        self._client = OpenAI(api_key=api_key)
+
+    def embed_documents(self, texts):
+        from openai import RateLimitError
+
+        for attempt in range(settings.RAG_EMBED_MAX_RETRIES + 1):
+            try:
+                response = self._client.embeddings.create(
+                    model=self.model, input=list(texts)
+                )
+                return [item.embedding for item in response.data]
+            except RateLimitError:
+                if attempt == settings.RAG_EMBED_MAX_RETRIES:
+                    raise
+                time.sleep(2**attempt)
+
+
+class _QueryCachedEmbeddings:
+    """
+    Wraps the embedding model so a repeated query skips the OpenAI round-trip.
+    """
+
+    def __init__(self, inner, maxsize: int):
+        self._inner = inner
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        return self._inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts):
+        """Query vectors in order; all cache misses go out in one request."""
+        keys = [_query_key(text) for text in texts]
+        with self._lock:
+            vecs = [self._cache.get(key) for key in keys]
+        misses = [i for i, vec in enumerate(vecs) if vec is None]
+        if misses:
+            fresh = self._inner.embed_documents([texts[i] for i in misses])
+            with self._lock:
+                for i, vec in zip(misses, fresh):
+                    vecs[i] = self._cache[keys[i]] = vec
+        return vecs
+
+
+class _SemanticCache:
+    """
+    Ring buffer of (unit query vector, answer, stored_at). A lookup is one
+    matrix-vector product; the best match above the threshold within TTL wins.
+    """
+
+    def __init__(self, size: int, threshold: float, ttl: float):
+        self.size = size
+        self.threshold = threshold
+        self.ttl = ttl
+        self._vecs = None  # allocated on first put, once the dimension is known
+        self._answers = [None] * size
+        self._stored_at = np.full(size, -np.inf)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def get(self, vec: np.ndarray):
+        with self._lock:
+            if self._vecs is None:
+                return None
+            sims = self._vecs @ vec
+            sims[self._stored_at < time.monotonic() - self.ttl] = -1.0
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                return self._answers[best]
+        return None
+
+    def put(self, vec: np.ndarray, answer: str) -> None:
+        with self._lock:
+            if self._vecs is None:
+                self._vecs = np.zeros((self.size, vec.shape[0]), dtype=np.float32)
+            i = self._next
+            self._vecs[i] = vec
+            self._answers[i] = answer
+            self._stored_at[i] = time.monotonic()
+            self._next = (i + 1) % self.size
+
 
 class MedicalRetriever:
     """
     Enhanced Medical Retriever with Recursive Splitting and Error Handling.
     Uses configurable paths for global deployment.
+
+    A saved index and its chunk texts are memory-mapped read-only, so startup
+    does not read them in full and worker processes share the pages through the
+    OS page cache. Keep INDEX_DIR on local disk: page-ins from a network
+    filesystem turn into per-query latency.
     """
 
     def __init__(self, data_path=None, index_path=None):
@@ -24,8 +147,17 @@ class MedicalRetriever:
         )
         self.index_path = Path(index_path) if index_path else settings.INDEX_DIR
         self._embeddings = None
-        self.vector_db = None
+        self.vector_db = None  # raw faiss index
+        self._docs = []  # faiss row id -> chunk text
         # Lazy initialization: do not call _initialize_db() here
+        # Exact answers keyed on (normalized query, k); paraphrases per k
+        self._answers: TTLCache = TTLCache(
+            maxsize=settings.RAG_CACHE_SIZE, ttl=settings.RAG_CACHE_TTL
+        )
+        self._answers_lock = threading.Lock()
+        self._semantic = {}
+        # Queries run on worker threads; only one of them loads or builds the index
+        self._init_lock = threading.Lock()
 
     def _initialize_db(self):
         """Initialize the vector database with medical guidelines."""
@@ -33,43 +165,31 @@ class MedicalRetriever:
         self.index_path.mkdir(parents=True, exist_ok=True)
 
         if self._embeddings is None:
-            from langchain_openai import OpenAIEmbeddings
-
-            self._embeddings = OpenAIEmbeddings(
-                model=settings.EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY
+            self._embeddings = _QueryCachedEmbeddings(
+                _OpenAIEmbeddings(settings.EMBEDDING_MODEL, settings.OPENAI_API_KEY),
+                maxsize=settings.RAG_CACHE_SIZE,
             )
 
-        # Check if index already exists to avoid re-embedding
-        index_file = self.index_path / "index.faiss"
-        if index_file.exists():
-            try:
-                from langchain_community.vectorstores import FAISS
-
-                # SECURITY: allow_dangerous_deserialization=True is required by FAISS for pickle load.
-                # Only load indexes built in a trusted environment. Do not load FAISS index from
-                # untrusted sources (risk of arbitrary code execution). See DEPLOYMENT.md.
-                self.vector_db = FAISS.load_local(
-                    str(self.index_path),
-                    self._embeddings,
-                    allow_dangerous_deserialization=True,
-                )
-                logger.info("Loaded existing FAISS index.")
-                return
-            except Exception as e:
-                logger.warning(f"Error loading index: {e}. Rebuilding...")
+        import faiss
 
-        if not self.data_path.exists():
+        # Indexes live in a directory named after what they were built from, so
+        # an unchanged corpus and model are loaded, never re-embedded
+        data = self.data_path.read_bytes() if self.data_path.exists() else None
+        name = self._fingerprint(data) if data is not None else "latest"
+        index_dir = self.index_path / name
+        if self._load_index(index_dir):
+            return
+
+        if data is None:
             logger.error(
                 f"Critical Error: {self.data_path} not found. Please run data generator."
             )
             return
 
         try:
-            from langchain_core.documents import Document
             from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-            with open(self.data_path, "r", encoding="utf-8") as f:
-                guidelines = json.load(f)
+            guidelines = orjson.loads(data)
 
             text_splitter = RecursiveCharacterTextSplitter(
                 chunk_size=settings.RAG_CHUNK_SIZE,
@@ -77,40 +197,175 @@ class MedicalRetriever:
                 separators=["\n\n", "\n", ".", " "],
             )
 
-            documents = []
-            for item in guidelines:
-                content = (
-                    f"### MEDICAL PROTOCOL: {item.get('condition', 'Unknown')} ###\n"
-                    f"Category: {item.get('category', 'General')}\n"
-                    f"Guideline Details: {item.get('guideline', 'N/A')}\n"
-                    f"Diagnostic Indicators: {item.get('indicators', 'N/A')}\n"
-                    f"First-line Treatment: {item.get('treatment', 'N/A')}\n"
+            contents = [
+                f"### MEDICAL PROTOCOL: {item.get('condition', 'Unknown')} ###\n"
+                f"Category: {item.get('category', 'General')}\n"
+                f"Guideline Details: {item.get('guideline', 'N/A')}\n"
+                f"Diagnostic Indicators: {item.get('indicators', 'N/A')}\n"
+                f"First-line Treatment: {item.get('treatment', 'N/A')}\n"
+                for item in guidelines
+            ]
+            # Use chunks for better granularity in retrieval; one splitter
+            # pass over every protocol, each chunk tagged with its condition
+            documents = text_splitter.create_documents(
+                contents,
+                metadatas=[
+                    {
+                        "source": "medical_guidelines",
+                        "condition": item.get("condition", "Unknown"),
+                    }
+                    for item in guidelines
+                ],
+            )
+            texts = [doc.page_content for doc in documents]
+            metas = [doc.metadata for doc in documents]
+
+            if texts:
+                # Unchanged chunks come from the on-disk cache; only misses are
+                # embedded, in explicit large batches sent concurrently
+                vectors = np.asarray(
+                    EmbeddingCache(
+                        settings.EMBEDDING_CACHE_PATH, settings.EMBEDDING_MODEL
+                    ).embed_documents(
+                        texts,
+                        self._embeddings.embed_documents,
+                        settings.RAG_EMBED_BATCH_SIZE,
+                        settings.RAG_EMBED_CONCURRENCY,
+                    ),
+                    dtype=np.float32,
                 )
-                # Use chunks for better granularity in retrieval
-                chunks = text_splitter.split_text(content)
-                for chunk in chunks:
-                    doc = Document(
-                        page_content=chunk,
-                        metadata={
-                            "source": "medical_guidelines",
-                            "condition": item.get("condition", "Unknown"),
-                        },
-                    )
-                    documents.append(doc)
-
-            if documents:
-                from langchain_community.vectorstores import FAISS
-
-                self.vector_db = FAISS.from_documents(documents, self._embeddings)
-                self.vector_db.save_local(str(self.index_path))
+                # Unit vectors + inner product: the search score is the cosine.
+                # Codes are stored as fp16: half the RAM and scan bandwidth of
+                # float32, with scores within ~1e-4 on unit vectors
+                faiss.normalize_L2(vectors)
+                index = faiss.IndexScalarQuantizer(
+                    vectors.shape[1],
+                    faiss.ScalarQuantizer.QT_fp16,
+                    faiss.METRIC_INNER_PRODUCT,
+                )
+                index.train(vectors)
+                index.add(vectors)
+                index = self._compact_index(index)
+
+                self._save_index(index_dir, index, texts, metas)
+                self._docs = texts
+                self.vector_db = index
                 logger.info(
-                    f"Medical RAG Database initialized with {len(documents)} document chunks."
+                    f"Medical RAG Database initialized with {len(texts)} document chunks."
                 )
             else:
                 logger.warning("No documents to index.")
         except Exception as e:
             logger.error(f"Error initializing vector database: {e}")
 
+    @staticmethod
+    def _fingerprint(data: bytes) -> str:
+        """Index directory name: guidelines content, chunking and index layout."""
+        digest = hashlib.sha256(data)
+        digest.update(
+            f"|{settings.EMBEDDING_MODEL}|{settings.RAG_CHUNK_SIZE}"
+            f"|{settings.RAG_CHUNK_OVERLAP}|{_INDEX_FORMAT}".encode()
+        )
+        return digest.hexdigest()[:16]
+
+    def _load_index(self, index_dir: Path) -> bool:
+        """
+        Map a saved index read-only. Only plain faiss and numpy files are read
+        back, so no pickle is ever deserialized.
+        """
+        import faiss
+
+        index_file = index_dir / "index.faiss"
+        if not index_file.exists():
+            return False
+        try:
+            index = faiss.read_index(
+                str(index_file), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            )
+            self._docs = np.load(
+                index_dir / "docs.npy", mmap_mode="r", allow_pickle=False
+            )
+        except Exception as e:
+            logger.warning(f"Error loading index: {e}. Rebuilding...")
+            return False
+        self._set_nprobe(index)
+        self.vector_db = index
+        logger.info(f"Loaded existing FAISS index {index_dir.name}.")
+        return True
+
+    def _save_index(self, index_dir: Path, index, texts, metas) -> None:
+        """
+        Write into a temporary directory and rename it into place, so a crash
+        mid-write never leaves a partial index behind, then repoint latest.
+        """
+        import faiss
+
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.index_path))
+        try:
+            tmp.chmod(0o755)  # mkdtemp is owner-only; workers may run as others
+            faiss.write_index(index, str(tmp / "index.faiss"))
+            np.save(tmp / "docs.npy", np.array(texts), allow_pickle=False)
+            (tmp / "metas.json").write_bytes(orjson.dumps(metas))
+            os.replace(tmp, index_dir)
+        except OSError:
+            # Another process finished the same build first; keep its copy
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not (index_dir / "index.faiss").exists():
+                raise
+
+        # latest -> the index just built, for operators (and loads without data)
+        link = self.index_path / "latest"
+        tmp_link = self.index_path / f".latest-{os.getpid()}"
+        try:
+            tmp_link.unlink(missing_ok=True)
+            tmp_link.symlink_to(index_dir.name, target_is_directory=True)
+            os.replace(tmp_link, link)
+        except OSError as e:
+            logger.warning(f"Could not update {link}: {e}")
+
+    @staticmethod
+    def _compact_index(index):
+        """
+        Large corpora: re-pack the exhaustive index as IVF (nlist ~ sqrt(N)) with
+        fp16 codes, so a query scans RAG_NPROBE lists instead of every vector.
+        Row order is kept, so faiss ids still index self._docs.
+        """
+        n = index.ntotal
+        if n < settings.RAG_IVF_MIN_VECTORS:
+            return index
+        import faiss
+
+        xb = index.reconstruct_n(0, n)
+        d = xb.shape[1]
+        ivf = faiss.IndexIVFScalarQuantizer(
+            faiss.IndexFlatIP(d),
+            d,
+            int(np.sqrt(n)),
+            faiss.ScalarQuantizer.QT_fp16,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+        ivf.train(xb)
+        ivf.add(xb)
+        MedicalRetriever._set_nprobe(ivf)
+        logger.info(f"FAISS index re-packed as IVF{ivf.nlist},SQfp16 over {n} vectors.")
+        return ivf
+
+    @staticmethod
+    def _set_nprobe(index) -> None:
+        import faiss
+
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = settings.RAG_NPROBE
+
+    def ensure_index(self) -> bool:
+        """Load or build the index now rather than on the first query."""
+        if self.vector_db is None:
+            with self._init_lock:
+                if self.vector_db is None:
+                    self._initialize_db()
+        return self.vector_db is not None
+
     def retrieve(self, query, k=None):
         """
         Retrieve context using Similarity Search with Relevance Scoring.
@@ -122,36 +377,99 @@ class MedicalRetriever:
         Returns:
             Retrieved medical context or error message
         """
-        if not self.vector_db:
-            self._initialize_db()
+        return self.retrieve_batch([query], k)[0]
 
-        if not self.vector_db:
-            return "No medical data available. Please ensure the medical guidelines database is initialized."
+    def retrieve_batch(self, queries, k=None):
+        """
+        Retrieve context for many queries at once: cache misses are embedded in
+        one request and searched with a single FAISS call.
 
-        if not query or len(query.strip()) == 0:
-            return "No query provided."
+        Returns:
+            One context (or error message) per query, in order
+        """
+        if not self.ensure_index():
+            return [
+                "No medical data available. Please ensure the medical guidelines database is initialized."
+            ] * len(queries)
 
         k = k or settings.RAG_TOP_K
+        results = [None] * len(queries)
+        pending = {}  # cache key -> indexes of queries waiting on it
+        with self._answers_lock:
+            for i, query in enumerate(queries):
+                if not query or len(query.strip()) == 0:
+                    results[i] = "No query provided."
+                    continue
+                key = (_query_key(query), k)
+                cached = self._answers.get(key)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    pending.setdefault(key, []).append(i)
+        if not pending:
+            return results
 
+        keys = list(pending)
+        texts = [queries[pending[key][0]] for key in keys]
         try:
-            # Using similarity search with score to filter out low-quality matches
-            docs_and_scores = self.vector_db.similarity_search_with_relevance_scores(
-                query, k=k
+            vecs = np.asarray(self._embeddings.embed_queries(texts), dtype=np.float32)
+            # Paraphrase of a recent query: reuse its answer, skip the FAISS search
+            units = vecs / np.maximum(
+                np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12
+            )
+            semantic = self._semantic_cache(k)
+            answers = [semantic.get(unit) for unit in units]
+            misses = [n for n, answer in enumerate(answers) if answer is None]
+            if misses:
+                for n, answer in zip(misses, self._search(units[misses], k)):
+                    answers[n] = answer
+                    semantic.put(units[n], answer)
+        except Exception as e:
+            logger.error(f"Error retrieving documents: {e}")
+            answers = [
+                "Error retrieving medical information. Please try again or consult a healthcare professional."
+            ] * len(keys)
+        else:
+            with self._answers_lock:
+                self._answers.update(zip(keys, answers))
+
+        for key, answer in zip(keys, answers):
+            for i in pending[key]:
+                results[i] = answer
+        return results
+
+    def _semantic_cache(self, k: int) -> _SemanticCache:
+        cache = self._semantic.get(k)
+        if cache is None:
+            cache = self._semantic.setdefault(
+                k,
+                _SemanticCache(
+                    settings.RAG_SEM_CACHE_SIZE,
+                    settings.RAG_SEM_CACHE_THRESHOLD,
+                    settings.RAG_CACHE_TTL,
+                ),
             )
+        return cache
 
+    def _search(self, units: np.ndarray, k: int) -> list:
+        """One FAISS inner-product search for a (n, d) batch of unit query vectors."""
+        min_cosine = _relevance_to_cosine(settings.RAG_RELEVANCE_THRESHOLD)
+        scores, ids = self.vector_db.search(np.ascontiguousarray(units), k)
+        answers = []
+        for row_scores, row_ids in zip(scores, ids):
+            # Filter out low-quality matches by relevance score
             relevant_docs = [
-                doc.page_content
-                for doc, score in docs_and_scores
-                if score > settings.RAG_RELEVANCE_THRESHOLD
+                str(self._docs[doc_id])
+                for score, doc_id in zip(row_scores, row_ids)
+                if doc_id != -1 and score > min_cosine
             ]
-
             if not relevant_docs:
-                return "No matching clinical protocols found for these symptoms. Please consult a healthcare professional."
-
-            return "\n\n---\n\n".join(relevant_docs)
-        except Exception as e:
-            logger.error(f"Error retrieving documents: {e}")
-            return "Error retrieving medical information. Please try again or consult a healthcare professional."
+                answers.append(
+                    "No matching clinical protocols found for these symptoms. Please consult a healthcare professional."
+                )
+            else:
+                answers.append("\n\n---\n\n".join(relevant_docs))
+        return answers
 
 
 if __name__ == "__main__":
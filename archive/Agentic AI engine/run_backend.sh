@@ -3,4 +3,4 @@
 cd "$(dirname "$0")"
 [[ -f venv/bin/activate ]] && source venv/bin/activate
 echo "Starting MedAgent API at http://localhost:8000 ..."
-python -m uvicorn api.main:app --host 0.0.0.0 --port 8000
+python -m uvicorn api.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
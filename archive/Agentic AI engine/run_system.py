@@ -3,11 +3,18 @@ Unified Startup Script for MEDAgent.
 Launches the FastAPI backend and Streamlit frontend in parallel.
 """
 
+import asyncio
+import glob
 import os
 import signal
 import subprocess
 import sys
-import time
+import threading
+
+SHUTDOWN_TIMEOUT = 10  # seconds a service gets to exit before it is killed
+READY_URL = "http://localhost:8000/ready"
+READY_TIMEOUT = 60  # seconds to wait for the backend before starting the UI anyway
+READY_POLL_INTERVAL = 0.1
 
 
 def kill_port(port):
@@ -27,6 +34,19 @@ def kill_port(port):
         pass
 
 
+def build_knowledge_base():
+    try:
+        from rag.retriever import MedicalRetriever
+
+        if MedicalRetriever().ensure_index():
+            print("[OK] Knowledge Base Initialized.")
+        else:
+            print("[ERROR] Failed to initialize RAG: no index was built.")
+    except Exception as e:
+        print(f"[ERROR] Failed to initialize RAG: {e}")
+        # Non-critical for launch, continue startup
+
+
 def pre_flight_checks():
     """Ensure system requirements are met before launch."""
     print("[SYSTEM] Running Pre-flight Checks...")
@@ -65,20 +85,19 @@ def pre_flight_checks():
         return False
 
     # 3. Check RAG Index (optional initialization)
-    index_path = os.path.join(
-        os.path.dirname(__file__), "rag", "faiss_index", "index.faiss"
+    # Indexes are built into rag/faiss_index/<fingerprint>/
+    index_files = glob.glob(
+        os.path.join(
+            os.path.dirname(__file__), "rag", "faiss_index", "*", "index.faiss"
+        )
     )
-    if not os.path.exists(index_path):
+    if not index_files:
         if os.getenv("INIT_RAG_ON_START", "false").lower() == "true":
-            print("[INFO] FAISS index missing. Initializing Knowledge Base...")
-            try:
-                from rag.retriever import MedicalRetriever
-
-                MedicalRetriever()
-                print("[OK] Knowledge Base Initialized.")
-            except Exception as e:
-                print(f"[ERROR] Failed to initialize RAG: {e}")
-                # Non-critical for launch, continue startup
+            # Embedding the guidelines takes a while; the backend boots meanwhile
+            print(
+                "[INFO] FAISS index missing. Initializing Knowledge Base in the background..."
+            )
+            threading.Thread(target=build_knowledge_base, daemon=True).start()
         else:
             print(
                 "[INFO] FAISS index missing. Skipping initialization (set INIT_RAG_ON_START=true to build)."
@@ -100,7 +119,7 @@ def pre_flight_checks():
     return True
 
 
-def run_backend():
+async def run_backend():
     print("[SYSTEM] Starting Backend API (Uvicorn)...")
     
     # Environment Hardening: Inject system paths and site-packages
@@ -112,22 +131,26 @@ def run_backend():
         my_env["PYTHONPATH"] = f"{user_site};{existing_path}" if existing_path else user_site
         print(f"[DEBUG] Injected user-site: {user_site}")
 
-    return subprocess.Popen(
-        [
-            sys.executable,
-            "-m",
-            "uvicorn",
-            "api.main:app",
-            "--host",
-            "0.0.0.0",
-            "--port",
-            "8000",
-        ],
-        env=my_env
-    )
+    cmd = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "api.main:app",
+        "--host",
+        "0.0.0.0",
+        "--port",
+        "8000",
+        "--http",
+        "httptools",
+    ]
+    # uvloop has no Windows build
+    if sys.platform != "win32":
+        cmd += ["--loop", "uvloop"]
 
+    return await asyncio.create_subprocess_exec(*cmd, env=my_env)
 
-def run_frontend():
+
+async def run_frontend():
     print("[SYSTEM] Starting Frontend UI (Streamlit)...")
     
     my_env = os.environ.copy()
@@ -136,60 +159,100 @@ def run_frontend():
         existing_path = my_env.get("PYTHONPATH", "")
         my_env["PYTHONPATH"] = f"{user_site};{existing_path}" if existing_path else user_site
 
-    return subprocess.Popen(
-        [
-            sys.executable,
-            "-m",
-            "streamlit",
-            "run",
-            "api/frontend.py",
-            "--server.port",
-            "8501",
-            "--server.headless",
-            "true",
-        ],
+    return await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "streamlit",
+        "run",
+        "api/frontend.py",
+        "--server.port",
+        "8501",
+        "--server.headless",
+        "true",
         env=my_env
     )
 
 
-if __name__ == "__main__":
-    print("=" * 60)
-    print("      MEDAGENT GLOBAL SYSTEM - STARTUP INITIATED")
-    print("=" * 60)
+async def wait_until_ready(backend_proc):
+    """Poll the backend's /ready until it answers 200, it exits, or READY_TIMEOUT."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + READY_TIMEOUT
+    async with httpx.AsyncClient(timeout=1.0) as client:
+        while backend_proc.returncode is None and loop.time() < deadline:
+            try:
+                if (await client.get(READY_URL)).status_code == 200:
+                    return True
+            except httpx.HTTPError:
+                pass  # Not listening yet
+            await asyncio.sleep(READY_POLL_INTERVAL)
+    return False
 
+
+async def stop(proc):
+    """Ask a service to exit; kill it if it is still up after SHUTDOWN_TIMEOUT."""
+    if proc.returncode is not None:
+        return
+    proc.terminate()
+    try:
+        await asyncio.wait_for(proc.wait(), SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+async def supervise():
+    """Run both services until either exits or Ctrl+C, then stop the other."""
     backend_proc = None
     frontend_proc = None
 
     try:
-        if not pre_flight_checks():
-            print("[CRITICAL] Pre-flight checks failed. Aborting startup.")
-            sys.exit(1)
-
-        backend_proc = run_backend()
-        time.sleep(3)  # Give backend a moment to bind to port
+        backend_proc = await run_backend()
+        if not await wait_until_ready(backend_proc):
+            print("[WARNING] Backend is not ready yet. Starting frontend anyway.")
 
-        frontend_proc = run_frontend()
+        frontend_proc = await run_frontend()
 
         print("\n[SUCCESS] Both services are running.")
         print("Backend: http://localhost:8000")
         print("Frontend: http://localhost:8501")
         print("\nPress Ctrl+C to terminate both servers.")
 
-        # Keep the main script alive while processes are running
-        while True:
-            if backend_proc.poll() is not None:
-                print("[ERROR] Backend process terminated unexpectedly.")
-                break
-            if frontend_proc.poll() is not None:
-                print("[ERROR] Frontend process terminated unexpectedly.")
-                break
-            time.sleep(1)
+        # Wake only when a process exits, no polling
+        waiters = {
+            asyncio.ensure_future(backend_proc.wait()): "Backend",
+            asyncio.ensure_future(frontend_proc.wait()): "Frontend",
+        }
+        done, pending = await asyncio.wait(
+            waiters, return_when=asyncio.FIRST_COMPLETED
+        )
+        for waiter in done:
+            print(f"[ERROR] {waiters[waiter]} process terminated unexpectedly.")
+        for waiter in pending:
+            waiter.cancel()
 
-    except KeyboardInterrupt:
+    except asyncio.CancelledError:
+        # asyncio.run cancels this task on Ctrl+C
         print("\n[SYSTEM] Shutting down...")
+        raise
     finally:
-        if backend_proc:
-            backend_proc.terminate()
-        if frontend_proc:
-            frontend_proc.terminate()
-        print("[SYSTEM] All services stopped.")
+        await asyncio.gather(
+            *(stop(proc) for proc in (backend_proc, frontend_proc) if proc)
+        )
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("      MEDAGENT GLOBAL SYSTEM - STARTUP INITIATED")
+    print("=" * 60)
+
+    if not pre_flight_checks():
+        print("[CRITICAL] Pre-flight checks failed. Aborting startup.")
+        sys.exit(1)
+
+    try:
+        asyncio.run(supervise())
+    except KeyboardInterrupt:
+        pass
+    print("[SYSTEM] All services stopped.")
@@ -1,8 +1,25 @@
 import os
 import sqlite3
+import sys
+from pathlib import Path
+
+# Run from project root so the models package resolves
+_root = Path(__file__).resolve().parents[1]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex
+
+from database.models import Base
 
 DB_PATH = "medagent.db"
 
+# Indexes the models no longer declare; superseded by a model index
+STALE_INDEXES = [
+    "ix_medical_images_patient_ts",  # keyset pages use ix_medical_images_patient_id
+]
+
 
 def add_indexes():
     if not os.path.exists(DB_PATH):
@@ -25,6 +42,31 @@ def add_indexes():
         print(f"Applying: {idx_sql}")
         cursor.execute(idx_sql)
 
+    # create_all never adds indexes to tables that already exist, so bring every
+    # index the models declare onto this database
+    tables = {
+        row[0]
+        for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    dialect = sqlite.dialect()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            idx_sql = str(
+                CreateIndex(index, if_not_exists=True).compile(dialect=dialect)
+            )
+            print(f"Applying: {index.name}")
+            try:
+                cursor.execute(idx_sql)
+            except sqlite3.OperationalError as e:
+                # e.g. a column added by archive/scripts/migrate_v2.py
+                print(f"Skipped {index.name}: {e}. Run migrate_v2 first.")
+
+    for name in STALE_INDEXES:
+        print(f"Dropping stale index: {name}")
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
     conn.commit()
     conn.close()
     print("Database indexing complete.")
@@ -3,12 +3,13 @@ import os
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from agents.orchestrator import MedAgentOrchestrator
+from api.deps import get_orchestrator
 
 
 async def test_workflow(name, symptoms, image=None):
     print(f"\n--- Testing Workflow: {name} ---")
-    orch = MedAgentOrchestrator()
+    # Process-wide instance: the graph and agents are built once, not per scenario
+    orch = get_orchestrator()
     result = await orch.run(symptoms, image_path=image)
     status = "SUCCESS" if result.get("status") != "error" else "FAILED"
     print(f"Result: {status}")
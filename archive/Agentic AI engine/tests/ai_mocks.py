@@ -1,3 +1,5 @@
+import hashlib
+import re
 import sys
 from unittest.mock import MagicMock
 
@@ -43,4 +45,27 @@ sys.modules["langchain_openai"] = MagicMock()
 sys.modules["langchain_openai"].ChatOpenAI = mock_chat
 sys.modules["langchain_openai"].OpenAIEmbeddings = mock_embeddings
 
+
+# The RAG retriever calls the OpenAI SDK directly, not langchain_openai
+class MockRAGEmbeddings:
+    """Deterministic bag-of-words vectors: texts sharing words are similar."""
+
+    def __init__(self, model, api_key):
+        self.model = model
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    @staticmethod
+    def _embed(text):
+        vec = [0.0] * 1536
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % 1536] += 1.0
+        return vec
+
+
+import rag.retriever
+
+rag.retriever._OpenAIEmbeddings = MockRAGEmbeddings
+
 print("DYNAMIC AI MOCK LAYER INITIALIZED")
@@ -297,6 +297,11 @@ async def test_database():
 # ═══════════════════════════════════════════
 # 4 & 5. END-TO-END WORKFLOWS
 # ═══════════════════════════════════════════
+async def _timed_run(label, orch, *args, **kwargs):
+    with timed(label):
+        return await orch.run(*args, **kwargs)
+
+
 async def test_e2e_workflow(agents_loaded: dict, api_key_available: bool):
     logger.info("═══ 4. END-TO-END WORKFLOW (ENGLISH) ═══")
     orch = agents_loaded.get("Orchestrator")
@@ -320,12 +325,27 @@ async def test_e2e_workflow(agents_loaded: dict, api_key_available: bool):
         )
         return
 
+    # Both runs wait on the LLM; share the one orchestrator and overlap them
+    result_en, result_ar = await asyncio.gather(
+        _timed_run(
+            "e2e_english",
+            orch,
+            "I have a severe headache and sensitivity to light.",
+            user_id="test_en",
+        ),
+        _timed_run(
+            "e2e_arabic",
+            orch,
+            "أشعر بألم شديد في الصدر وضيق في التنفس",
+            user_id="test_ar",
+        ),
+        return_exceptions=True,
+    )
+
     # --- English ---
     try:
-        with timed("e2e_english"):
-            result_en = await orch.run(
-                "I have a severe headache and sensitivity to light.", user_id="test_en"
-            )
+        if isinstance(result_en, Exception):
+            raise result_en
         is_ok = result_en.get("status") != "error" and bool(
             result_en.get("final_response")
         )
@@ -350,10 +370,8 @@ async def test_e2e_workflow(agents_loaded: dict, api_key_available: bool):
     # --- Arabic ---
     logger.info("═══ 5. END-TO-END WORKFLOW (ARABIC) ═══")
     try:
-        with timed("e2e_arabic"):
-            result_ar = await orch.run(
-                "أشعر بألم شديد في الصدر وضيق في التنفس", user_id="test_ar"
-            )
+        if isinstance(result_ar, Exception):
+            raise result_ar
         is_ok = result_ar.get("status") != "error" and bool(
             result_ar.get("final_response")
         )
@@ -0,0 +1,82 @@
+"""
+Batch consult rate limiting - a batch is charged per item, all or nothing.
+"""
+
+import os
+
+# Set env vars before any imports
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-testing-12345")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.deps import get_current_user
+from api.routes import clinical
+from config import settings
+from utils.rate_limit import InMemoryRateLimiter, check_rate_limit
+
+
+class _StubOrchestrator:
+    def __init__(self):
+        self.calls = 0
+
+    async def run(self, symptoms, **kwargs):
+        self.calls += 1
+        return {"status": "success", "final_response": symptoms}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+    monkeypatch.setattr(
+        check_rate_limit, "_limiter", InMemoryRateLimiter(20), raising=False
+    )
+    orch = _StubOrchestrator()
+    monkeypatch.setattr(clinical, "get_orchestrator", lambda: orch)
+
+    app = FastAPI()
+    app.include_router(clinical.router)
+    app.dependency_overrides[get_current_user] = lambda: {
+        "sub": "u1",
+        "role": "patient",
+    }
+    with TestClient(app) as test_client:
+        yield test_client, orch
+
+
+def _batch(n):
+    return {"items": [{"symptoms": f"cough {i}"} for i in range(n)]}
+
+
+def test_batch_requires_auth():
+    app = FastAPI()
+    app.include_router(clinical.router)
+    response = TestClient(app).post("/clinical/consult/batch", json=_batch(1))
+    assert response.status_code == 401
+
+
+def test_batch_charges_one_slot_per_item(client):
+    test_client, orch = client
+    response = test_client.post("/clinical/consult/batch", json=_batch(16))
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 16
+    assert orch.calls == 16
+    # 4 of 20 slots left
+    assert check_rate_limit("user:u1", cost=4) == (True, 0)
+    assert check_rate_limit("user:u1")[0] is False
+
+
+def test_rejected_batch_runs_nothing_and_charges_nothing(client):
+    test_client, orch = client
+    assert check_rate_limit("user:u1", cost=10) == (True, 0)
+
+    response = test_client.post("/clinical/consult/batch", json=_batch(16))
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+    assert orch.calls == 0
+    # The 10 remaining slots are still there for a batch that fits
+    response = test_client.post("/clinical/consult/batch", json=_batch(10))
+    assert response.status_code == 200
+    assert orch.calls == 10
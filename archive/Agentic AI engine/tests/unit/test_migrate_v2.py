@@ -0,0 +1,75 @@
+"""
+Migration test - legacy Enum (VARCHAR) columns become SMALLINT enum codes.
+"""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from database.models import (Interaction, MedicalReport, ReviewStatus,
+                             UserAccount, UserRole)
+
+MIGRATE_V2 = Path(__file__).resolve().parents[2] / "archive/scripts/migrate_v2.py"
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("migrate_v2", MIGRATE_V2)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy_ddl(table, col_name, varchar):
+    """The model's DDL with the enum column declared as the old VARCHAR."""
+    ddl = str(CreateTable(table).compile(dialect=sqlite.dialect()))
+    return ddl.replace(f"{col_name} SMALLINT", f"{col_name} {varchar}", 1)
+
+
+def test_legacy_enum_rows_round_trip(tmp_path):
+    db_path = tmp_path / "medagent.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(_legacy_ddl(UserAccount.__table__, "role", "VARCHAR(7)"))
+    conn.execute(_legacy_ddl(Interaction.__table__, "review_status", "VARCHAR(8)"))
+    conn.execute(_legacy_ddl(MedicalReport.__table__, "status", "VARCHAR(8)"))
+    conn.executemany(
+        "INSERT INTO user_accounts (id, username, role) VALUES (?, ?, ?)",
+        # A name from before EnumCode, and a code the old migration left as text
+        [("u1", "doc", "DOCTOR"), ("u2", "admin", "1")],
+    )
+    conn.execute("INSERT INTO interactions (id, review_status) VALUES (1, 'FLAGGED')")
+    conn.execute("INSERT INTO medical_reports (id, status) VALUES (1, 'PENDING')")
+    conn.commit()
+    conn.close()
+
+    migration = _load_migration()
+    migration.migrate(str(db_path))
+    # Re-running is a no-op
+    migration.migrate(str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    role_type = {
+        row[1]: row[2] for row in conn.execute("PRAGMA table_info(user_accounts)")
+    }
+    assert role_type["role"] == "SMALLINT"
+    assert conn.execute("SELECT typeof(role) FROM user_accounts").fetchall() == [
+        ("integer",),
+        ("integer",),
+    ]
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(user_accounts)")}
+    assert "ix_user_accounts_username" in indexes
+    conn.close()
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as session:
+        assert session.get(UserAccount, "u1").role == UserRole.DOCTOR
+        assert session.get(UserAccount, "u2").role == UserRole.ADMIN
+        assert session.get(Interaction, 1).review_status == ReviewStatus.FLAGGED
+        assert session.get(MedicalReport, 1).status == ReviewStatus.PENDING
+        doctors = session.query(UserAccount).filter(UserAccount.role == UserRole.DOCTOR)
+        assert [user.id for user in doctors] == ["u1"]
+    engine.dispose()
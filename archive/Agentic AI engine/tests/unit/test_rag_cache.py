@@ -0,0 +1,196 @@
+"""
+RAG caching - query embeddings, exact and paraphrase answers, and the
+build-time embedding cache.
+"""
+
+import time
+
+import numpy as np
+import orjson
+import pytest
+
+from config import settings
+from rag.embedding_cache import EmbeddingCache
+from rag.retriever import (MedicalRetriever, _query_key,
+                           _QueryCachedEmbeddings, _SemanticCache)
+from tests import ai_mocks  # patches the retriever onto mock embeddings
+
+GUIDELINES = [
+    {
+        "condition": "Asthma",
+        "category": "Respiratory",
+        "guideline": "wheeze inhaler bronchospasm",
+        "indicators": "wheeze",
+        "treatment": "salbutamol inhaler",
+    },
+    {
+        "condition": "Migraine",
+        "category": "Neurology",
+        "guideline": "headache aura photophobia",
+        "indicators": "headache",
+        "treatment": "triptan",
+    },
+]
+
+
+class _CountingEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return ai_mocks.MockRAGEmbeddings(None, None).embed_documents(texts)
+
+
+def _unit(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _at_cosine(base, cosine):
+    """A unit vector whose cosine with unit vector base is exactly `cosine`."""
+    other = np.zeros_like(base)
+    other[np.argmin(np.abs(base))] = 1.0
+    other = _unit(other - (other @ base) * base)
+    return _unit(cosine * base + np.sqrt(1 - cosine**2) * other)
+
+
+# --- QUERY EMBEDDING CACHE ---
+def test_query_key_normalizes_case_and_whitespace():
+    assert _query_key("Chest  pain\n") == _query_key("chest pain")
+    assert _query_key("chest pain") != _query_key("chest pains")
+
+
+def test_query_embeddings_hit_on_normalized_key():
+    inner = _CountingEmbeddings()
+    embeddings = _QueryCachedEmbeddings(inner, maxsize=16)
+
+    first = embeddings.embed_queries(["Chest pain", "fever"])
+    again = embeddings.embed_queries(["  CHEST pain ", "cough", "fever"])
+
+    # Only the one new query goes out, in a single request
+    assert inner.calls == [["Chest pain", "fever"], ["cough"]]
+    assert again[0] == first[0] and again[2] == first[1]
+
+
+# --- SEMANTIC (PARAPHRASE) CACHE ---
+def test_semantic_cache_threshold():
+    threshold = settings.RAG_SEM_CACHE_THRESHOLD
+    cache = _SemanticCache(size=4, threshold=threshold, ttl=60)
+    base = _unit(np.arange(1, 9))
+    cache.put(base, "answer")
+
+    assert cache.get(base) == "answer"
+    assert cache.get(_at_cosine(base, threshold + 0.005)) == "answer"
+    assert cache.get(_at_cosine(base, threshold - 0.005)) is None
+
+
+def test_semantic_cache_ttl_expiry():
+    cache = _SemanticCache(size=4, threshold=0.9, ttl=0.05)
+    base = _unit(np.arange(1, 9))
+    cache.put(base, "answer")
+    assert cache.get(base) == "answer"
+    time.sleep(0.1)
+    assert cache.get(base) is None
+
+
+def test_semantic_cache_ring_buffer_overwrites_oldest():
+    cache = _SemanticCache(size=2, threshold=0.99, ttl=60)
+    vecs = [_unit(np.eye(8)[i]) for i in range(3)]
+    for i, vec in enumerate(vecs):
+        cache.put(vec, f"a{i}")
+    assert cache.get(vecs[0]) is None
+    assert [cache.get(vecs[1]), cache.get(vecs[2])] == ["a1", "a2"]
+
+
+# --- RETRIEVER ---
+@pytest.fixture
+def retriever(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_PATH", tmp_path / "emb.sqlite")
+    # Bag-of-words cosines are low; keep every top-k match
+    monkeypatch.setattr(settings, "RAG_RELEVANCE_THRESHOLD", -1.0)
+    data_path = tmp_path / "guidelines.json"
+    data_path.write_bytes(orjson.dumps(GUIDELINES))
+    r = MedicalRetriever(data_path=data_path, index_path=tmp_path / "index")
+    assert r.ensure_index()
+    inner = _CountingEmbeddings()
+    r._embeddings = _QueryCachedEmbeddings(inner, maxsize=16)
+    return r, inner
+
+
+def test_retrieve_batch_order_and_dedup(retriever, monkeypatch):
+    r, inner = retriever
+    searches = []
+    search = r._search
+    monkeypatch.setattr(
+        r, "_search", lambda units, k: searches.append(len(units)) or search(units, k)
+    )
+
+    results = r.retrieve_batch(
+        ["asthma wheeze", "", "migraine headache", "  Asthma WHEEZE"], k=1
+    )
+
+    assert "Asthma" in results[0]
+    assert results[1] == "No query provided."
+    assert "Migraine" in results[2]
+    assert results[3] == results[0]
+    # The duplicate shares one embedding and one search row
+    assert inner.calls == [["asthma wheeze", "migraine headache"]]
+    assert searches == [2]
+
+    # Exact repeat: answered from the answer cache, nothing embedded or searched
+    assert r.retrieve("ASTHMA wheeze", k=1) == results[0]
+    assert len(inner.calls) == 1 and searches == [2]
+
+
+def test_retrieve_paraphrase_skips_search(retriever, monkeypatch):
+    r, inner = retriever
+    first = r.retrieve("wheeze and inhaler", k=1)
+    monkeypatch.setattr(r, "_search", pytest.fail)
+
+    # Different exact key, same words: a semantic hit
+    assert r.retrieve("inhaler and wheeze", k=1) == first
+    assert len(inner.calls) == 2
+
+
+def test_retriever_reloads_saved_index(retriever, tmp_path):
+    r, _ = retriever
+    expected = r.retrieve("migraine headache", k=1)
+
+    reloaded = MedicalRetriever(
+        data_path=tmp_path / "guidelines.json", index_path=tmp_path / "index"
+    )
+    assert reloaded.ensure_index()
+    assert isinstance(reloaded._docs, np.memmap)
+    assert reloaded.retrieve("migraine headache", k=1) == expected
+
+
+# --- BUILD-TIME EMBEDDING CACHE ---
+def test_embedding_cache_embeds_only_misses(tmp_path):
+    cache = EmbeddingCache(tmp_path / "emb.sqlite", "model-a")
+    inner = _CountingEmbeddings()
+
+    first = cache.embed_documents(["a", "b", "a"], inner.embed_documents, 10)
+    assert inner.calls == [["a", "b"]]
+    assert np.array_equal(first[0], first[2])
+
+    second = cache.embed_documents(
+        ["c", "a", "d", "b", "e"], inner.embed_documents, batch_size=2
+    )
+    # Hits come from disk; misses go out batch_size at a time
+    assert inner.calls[1:] == [["c", "d"], ["e"]]
+    assert np.array_equal(second[1], first[0])
+    assert np.array_equal(second[3], first[1])
+    expected = inner.embed_documents(["c", "d", "e"])
+    assert [list(v) for v in (second[0], second[2], second[4])] == expected
+
+
+def test_embedding_cache_is_keyed_by_model(tmp_path):
+    inner = _CountingEmbeddings()
+    EmbeddingCache(tmp_path / "emb.sqlite", "model-a").embed_documents(
+        ["a"], inner.embed_documents, 10
+    )
+    EmbeddingCache(tmp_path / "emb.sqlite", "model-b").embed_documents(
+        ["a"], inner.embed_documents, 10
+    )
+    assert inner.calls == [["a"], ["a"]]
@@ -0,0 +1,93 @@
+"""
+Verified-token cache - entries never outlive the token, and revocation wins.
+"""
+
+import os
+
+# Set env vars before any imports
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-testing-12345")
+
+import time
+
+import jwt
+import pytest
+
+from agents import governance_agent
+from agents.governance_agent import GovernanceAgent
+from intelligence.inference_cache import inference_cache
+
+
+class _FakeBlacklist:
+    """Just the Redis calls the token blacklist makes."""
+
+    def __init__(self):
+        self.keys = {}
+
+    def setex(self, key, ttl, value):
+        self.keys[key] = value
+
+    def exists(self, key):
+        return int(key in self.keys)
+
+
+@pytest.fixture
+def gov(monkeypatch):
+    monkeypatch.setattr(inference_cache, "_enabled", False)
+    governance_agent._verified_tokens.clear()
+    yield GovernanceAgent()
+    governance_agent._verified_tokens.clear()
+
+
+@pytest.fixture
+def blacklist(monkeypatch):
+    fake = _FakeBlacklist()
+    monkeypatch.setattr(inference_cache, "_enabled", True)
+    monkeypatch.setattr(inference_cache, "_redis", fake, raising=False)
+    return fake
+
+
+def test_cache_entry_expires_with_the_token(gov):
+    now = time.time()
+    short = jwt.encode(
+        {"sub": "u1", "exp": int(now) + 2}, gov.jwt_secret, algorithm=gov.jwt_algorithm
+    )
+    long = gov.create_access_token({"sub": "u2"})
+    assert gov.verify_token(short)["sub"] == "u1"
+    assert gov.verify_token(long)["sub"] == "u2"
+
+    # Past the short token's exp but well inside TOKEN_CACHE_TTL
+    governance_agent._verified_tokens.expire(now + 3)
+    assert gov.cached_token_payload(short) is None
+    assert gov.cached_token_payload(long)["sub"] == "u2"
+
+
+def test_revoke_evicts_the_local_entry(gov):
+    token = gov.create_access_token({"sub": "u1"})
+    assert gov.verify_token(token) is not None
+    assert gov.cached_token_payload(token) is not None
+
+    assert gov.revoke_token(token) is True
+    assert gov.cached_token_payload(token) is None
+
+
+def test_revoked_token_is_rejected_on_a_cache_hit(gov, blacklist):
+    token = gov.create_access_token({"sub": "u1"})
+    assert gov.verify_token(token)["sub"] == "u1"
+    assert token in governance_agent._verified_tokens
+    # With the blacklist on, the no-I/O fast path is off
+    assert gov.cached_token_payload(token) is None
+
+    # Revoked by another worker: this process's cache is untouched
+    jti = jwt.decode(token, options={"verify_signature": False})["jti"]
+    blacklist.setex(f"token_blacklist:{jti}", 60, "revoked")
+
+    assert gov.verify_token(token) is None
+    assert token not in governance_agent._verified_tokens
+
+
+def test_revoke_token_blacklists_the_jti(gov, blacklist):
+    token = gov.create_access_token({"sub": "u1"})
+    assert gov.verify_token(token) is not None
+
+    assert gov.revoke_token(token) is True
+    assert gov.verify_token(token) is None
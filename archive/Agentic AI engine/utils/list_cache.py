@@ -0,0 +1,35 @@
+"""
+Short-lived per-user cache for decrypted list endpoints (/clinical/images, /reports).
+Dashboards poll these; entries are dropped as soon as the user gets a new image or report.
+Per-process only: with several workers a stale entry lives at most LIST_CACHE_TTL seconds.
+"""
+
+from threading import Lock
+from typing import Any, Optional
+
+from cachetools import TTLCache
+
+LIST_CACHE_TTL = 15  # seconds
+LIST_KINDS = ("images", "reports")
+
+_cache: TTLCache = TTLCache(maxsize=10_000, ttl=LIST_CACHE_TTL)
+_lock = Lock()
+
+
+def get_cached_list(kind: str, user_id: str) -> Optional[Any]:
+    with _lock:
+        return _cache.get((kind, user_id))
+
+
+def set_cached_list(kind: str, user_id: str, value: Any) -> None:
+    with _lock:
+        _cache[(kind, user_id)] = value
+
+
+def invalidate_user_lists(user_id: Optional[str]) -> None:
+    """Drop every cached list for a user after one of their records changes."""
+    if not user_id:
+        return
+    with _lock:
+        for kind in LIST_KINDS:
+            _cache.pop((kind, user_id), None)
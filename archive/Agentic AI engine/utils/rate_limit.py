@@ -45,27 +45,33 @@ class InMemoryRateLimiter:
         window_start = now - 60.0
         self._timestamps[key] = [t for t in self._timestamps[key] if t > window_start]
 
-    def is_allowed(self, identifier: str) -> Tuple[bool, int]:
+    def is_allowed(self, identifier: str, cost: int = 1) -> Tuple[bool, int]:
         """
         Returns (allowed, retry_after_seconds).
-        retry_after_seconds is 0 if allowed, else seconds until a slot frees.
+        Charges `cost` slots at once, or none if they do not all fit.
+        retry_after_seconds is 0 if allowed, else seconds until enough slots free.
         """
         with self._lock:
             now = time.monotonic()
             self._prune(identifier, now)
             timestamps = self._timestamps[identifier]
-            if len(timestamps) < self.max_per_minute:
-                timestamps.append(now)
+            if len(timestamps) + cost <= self.max_per_minute:
+                timestamps.extend([now] * cost)
                 return True, 0
-            oldest_in_window = min(timestamps)
-            retry_after = int(60 - (now - oldest_in_window)) + 1
+            if cost > self.max_per_minute:
+                return False, 60
+            # The slot that must expire before `cost` more fit
+            needed = len(timestamps) + cost - self.max_per_minute
+            freeing = sorted(timestamps)[needed - 1]
+            retry_after = int(60 - (now - freeing)) + 1
             retry_after = max(1, min(retry_after, 60))
             return False, retry_after
 
 
-def check_rate_limit(identifier: str) -> Tuple[bool, int]:
+def check_rate_limit(identifier: str, cost: int = 1) -> Tuple[bool, int]:
     """
     Check if the request from identifier is within rate limit.
+    `cost` requests are charged together: all of them or, if rejected, none.
     Returns (allowed, retry_after_seconds). Uses Redis if REDIS_URL is set, else in-memory.
     """
     from config import settings
@@ -81,11 +87,13 @@ def check_rate_limit(identifier: str) -> Tuple[bool, int]:
         try:
             window = int(time.time() // 60)
             key = f"ratelimit:{identifier}:{window}"
-            count = redis_client.incr(key)
-            if count == 1:
+            count = redis_client.incrby(key, cost)
+            if count == cost:
                 redis_client.expire(key, 120)  # 2 min TTL
             if count <= max_per_minute:
                 return True, 0
+            # Refund so a rejected batch does not use up the window
+            redis_client.decrby(key, cost)
             return False, 60  # retry after next minute
         except Exception as e:
             logger.warning("Redis rate limit check failed: %s. Allowing request.", e)
@@ -94,7 +102,7 @@ def check_rate_limit(identifier: str) -> Tuple[bool, int]:
     # In-memory
     if not hasattr(check_rate_limit, "_limiter"):
         check_rate_limit._limiter = InMemoryRateLimiter(max_per_minute)
-    return check_rate_limit._limiter.is_allowed(identifier)
+    return check_rate_limit._limiter.is_allowed(identifier, cost)
 
 
 def get_client_identifier(request) -> str:
@@ -0,0 +1,102 @@
+"""
+Short-lived response cache for idempotent, expensive endpoints
+(admin reports, lab interpretation).
+Uses Redis (shared across workers) if REDIS_URL is set, else an in-process TTL cache.
+Values are stored as serialized JSON bytes so cache hits skip re-encoding entirely.
+"""
+
+import logging
+import time
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from cachetools import TLRUCache
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "medagent:resp:"
+
+# value is (ttl, payload); each entry expires after its own ttl
+_local: TLRUCache = TLRUCache(
+    maxsize=1024, ttu=lambda _key, value, now: now + value[0], timer=time.monotonic
+)
+_local_lock = Lock()
+
+# Optional Redis
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is not None:
+        return _redis
+    if settings.REDIS_URL:
+        try:
+            import redis.asyncio as aioredis
+
+            _redis = aioredis.from_url(settings.REDIS_URL)
+        except Exception as e:
+            logger.warning(
+                "Redis not available for response cache: %s. Using in-memory.", e
+            )
+    return _redis
+
+
+async def _get(key: str) -> Optional[bytes]:
+    redis_client = _get_redis()
+    if redis_client:
+        try:
+            return await redis_client.get(KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning("Redis response cache get failed: %s", e)
+            return None
+    with _local_lock:
+        entry = _local.get(key)
+    return entry[1] if entry else None
+
+
+async def _set(key: str, payload: bytes, ttl: int) -> None:
+    redis_client = _get_redis()
+    if redis_client:
+        try:
+            await redis_client.setex(KEY_PREFIX + key, ttl, payload)
+        except Exception as e:
+            logger.warning("Redis response cache set failed: %s", e)
+        return
+    with _local_lock:
+        _local[key] = (ttl, payload)
+
+
+async def cached_json(
+    key: str,
+    ttl: int,
+    compute: Callable[[], Awaitable[Any]],
+    bypass: bool = False,
+) -> bytes:
+    """
+    Return the JSON body cached under key, computing and storing it on a miss.
+    bypass=True skips the lookup but still refreshes the entry.
+    """
+    if not bypass:
+        payload = await _get(key)
+        if payload is not None:
+            return payload
+    payload = orjson.dumps(await compute())
+    await _set(key, payload, ttl)
+    return payload
+
+
+async def invalidate(key: str) -> None:
+    """Drop a cached response after the data behind it changes."""
+    redis_client = _get_redis()
+    if redis_client:
+        try:
+            await redis_client.delete(KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning("Redis response cache delete failed: %s", e)
+        return
+    with _local_lock:
+        _local.pop(key, None)